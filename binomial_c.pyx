@@ -0,0 +1,60 @@
+# cython: language_level=3
+"""Compiled Cox-Ross-Rubinstein backward induction.
+
+Build in place with ``python setup.py build_ext --inplace``. The pure Python
+:func:`binomial_option.binomial_option_price` validates its inputs and delegates
+here when the extension is available and the lattice is not requested.
+"""
+cimport cython
+from libc.math cimport exp, sqrt
+
+import numpy as np
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def crr_price(
+    double spot,
+    double strike,
+    double maturity,
+    double rate,
+    double volatility,
+    int steps,
+    bint american,
+    bint is_call,
+    double dividend,
+):
+    """Return the CRR price of a European or American call or put."""
+    cdef double dt = maturity / steps
+    cdef double up = exp(volatility * sqrt(dt))
+    cdef double down = 1.0 / up
+    cdef double probability = (exp((rate - dividend) * dt) - down) / (up - down)
+    cdef double discount = exp(-rate * dt)
+    # Discounted transition weights, so each node costs two multiplies and an add.
+    cdef double p_up = discount * probability
+    cdef double p_dn = discount - p_up
+    cdef double[::1] values = np.empty(steps + 1)
+    cdef double[::1] prices = np.empty(steps + 1)
+    cdef double intrinsic
+    cdef Py_ssize_t step, j
+
+    # Terminal layer: node j has seen j up moves and steps - j down moves.
+    prices[0] = spot * down ** steps
+    for j in range(1, steps + 1):
+        prices[j] = prices[j - 1] * up * up
+    for j in range(steps + 1):
+        intrinsic = prices[j] - strike if is_call else strike - prices[j]
+        values[j] = intrinsic if intrinsic > 0.0 else 0.0
+
+    for step in range(steps - 1, -1, -1):
+        for j in range(step + 1):
+            values[j] = p_up * values[j + 1] + p_dn * values[j]
+            if american:
+                # Moving back one step multiplies every remaining node price by ``up``.
+                prices[j] = prices[j] * up
+                intrinsic = prices[j] - strike if is_call else strike - prices[j]
+                if intrinsic > values[j]:
+                    values[j] = intrinsic
+
+    return values[0]
@@ -1,16 +1,33 @@
 """Binomial option pricing model implementation.
 
 The module implements the Cox-Ross-Rubinstein binomial tree for both European and
-American options. It uses only the Python standard library.
+American options. Prices are computed with a single NumPy sweep over the current
+layer of option values; the full lattice is only built on request. When the
+optional Cython extension :mod:`binomial_c` is built, prices are delegated to it,
+otherwise to ``crr_vanilla`` from the Numba-compiled ``fast_kernels`` extension
+(see ``build_kernels.py``) if that is built.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 from math import exp, sqrt
-from typing import List, Literal
+from typing import Literal, Tuple
+
+import numpy as np
+
+try:
+    from binomial_c import crr_price as _crr_price
+except ImportError:  # pragma: no cover - optional compiled extension
+    try:
+        from fast_kernels import crr_vanilla as _crr_price
+    except ImportError:
+        _crr_price = None
 
 OptionType = Literal["call", "put"]
 
+_NO_LATTICE = np.empty((0, 0))
+_NO_LATTICE.flags.writeable = False
+
 
 def _validate_parameters(
     spot: float,
@@ -34,11 +51,16 @@ def _validate_parameters(
 
 @dataclass
 class BinomialTreeResult:
-    """Container for binomial pricing outputs."""
+    """Container for binomial pricing outputs.
+
+    ``asset_prices`` and ``option_values`` are empty unless the lattice was requested.
+    Otherwise they are ``(steps + 1, steps + 1)`` arrays where row ``step`` holds the
+    nodes of that step in ``[step, :step + 1]`` and the remaining entries are NaN.
+    """
 
     price: float
-    asset_prices: List[List[float]]
-    option_values: List[List[float]]
+    asset_prices: np.ndarray
+    option_values: np.ndarray
 
 
 def binomial_option_price(
@@ -51,6 +73,7 @@ def binomial_option_price(
     option_type: OptionType = "call",
     american: bool = False,
     dividend: float = 0.0,
+    return_lattice: bool = False,
 ) -> BinomialTreeResult:
     """Price an option with the Cox-Ross-Rubinstein binomial model.
 
@@ -64,9 +87,11 @@ def binomial_option_price(
         option_type: "call" or "put".
         american: If True, perform early exercise checks at each node.
         dividend: Continuous dividend yield (q) as a decimal.
+        return_lattice: If True, also return the full asset price and option value
+            lattices. This costs O(N^2) memory, so it is off by default.
 
     Returns:
-        BinomialTreeResult with the price and intermediate lattice values.
+        BinomialTreeResult with the price and, if requested, the lattice values.
     """
     _validate_parameters(spot, strike, maturity, rate, volatility, steps)
 
@@ -82,48 +107,78 @@ def binomial_option_price(
     if not 0 <= probability <= 1:
         raise ValueError("Arbitrage detected: adjust parameters (N, sigma, or rate).")
 
-    # Build asset price lattice.
-    asset_prices: List[List[float]] = []
+    discount = exp(-rate * dt)
+
+    if return_lattice:
+        asset_prices, option_values = _build_lattice(
+            spot, strike, steps, up, probability, discount, option_type, american
+        )
+        return BinomialTreeResult(
+            price=float(option_values[0, 0]), asset_prices=asset_prices, option_values=option_values
+        )
+
+    if _crr_price is not None:
+        price = _crr_price(
+            spot, strike, maturity, rate, volatility, steps, american, option_type == "call", dividend
+        )
+        return BinomialTreeResult(price=price, asset_prices=_NO_LATTICE, option_values=_NO_LATTICE)
+
+    # Discounted transition weights for the up and down moves.
+    p_up = discount * probability
+    p_dn = discount - p_up
+
+    # Terminal layer: node j has seen j up moves and steps - j down moves.
+    layer_prices = spot * up ** (2 * np.arange(steps + 1) - steps)
+    values = _intrinsic(layer_prices, strike, option_type)
+
+    # Backward induction, replacing the layer with the one before it each step.
+    # Node j of a layer sits one up move above node j of the next one.
+    for _ in range(steps):
+        values = p_up * values[1:] + p_dn * values[:-1]
+        if american:
+            layer_prices = layer_prices[:-1] * up
+            values = np.maximum(values, _intrinsic(layer_prices, strike, option_type))
+
+    return BinomialTreeResult(price=float(values[0]), asset_prices=_NO_LATTICE, option_values=_NO_LATTICE)
+
+
+def _intrinsic(prices: np.ndarray, strike: float, option_type: OptionType) -> np.ndarray:
+    if option_type == "call":
+        return np.maximum(prices - strike, 0.0)
+    return np.maximum(strike - prices, 0.0)
+
+
+def _build_lattice(
+    spot: float,
+    strike: float,
+    steps: int,
+    up: float,
+    probability: float,
+    discount: float,
+    option_type: OptionType,
+    american: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Build the full asset price and option value lattices as contiguous arrays."""
+    nodes = np.arange(steps + 1)
+    asset_prices = np.full((steps + 1, steps + 1), np.nan)
     for step in range(steps + 1):
-        level = [spot * (up ** j) * (down ** (step - j)) for j in range(step + 1)]
-        asset_prices.append(level)
-
-    # Terminal option values.
-    option_values: List[List[float]] = [[] for _ in range(steps + 1)]
-    terminal_values = []
-    for price in asset_prices[-1]:
-        if option_type == "call":
-            payoff = max(price - strike, 0)
-        else:
-            payoff = max(strike - price, 0)
-        terminal_values.append(payoff)
-    option_values[-1] = terminal_values
+        asset_prices[step, : step + 1] = spot * up ** (2 * nodes[: step + 1] - step)
 
-    discount = exp(-rate * dt)
+    option_values = np.full_like(asset_prices, np.nan)
+    option_values[steps] = _intrinsic(asset_prices[steps], strike, option_type)
 
-    # Backward induction.
+    # Backward induction, one stride-1 row at a time.
+    p_up = discount * probability
+    p_dn = discount - p_up
     for step in range(steps - 1, -1, -1):
-        current_values = []
-        for node in range(step + 1):
-            continuation = discount * (
-                probability * option_values[step + 1][node + 1]
-                + (1 - probability) * option_values[step + 1][node]
-            )
-            if american:
-                intrinsic = (
-                    max(asset_prices[step][node] - strike, 0)
-                    if option_type == "call"
-                    else max(strike - asset_prices[step][node], 0)
-                )
-                node_value = max(continuation, intrinsic)
-            else:
-                node_value = continuation
-            current_values.append(node_value)
-        option_values[step] = current_values
-
-    return BinomialTreeResult(
-        price=option_values[0][0], asset_prices=asset_prices, option_values=option_values
-    )
+        next_values = option_values[step + 1]
+        row = option_values[step, : step + 1]
+        np.multiply(next_values[1 : step + 2], p_up, out=row)
+        row += p_dn * next_values[: step + 1]
+        if american:
+            np.maximum(row, _intrinsic(asset_prices[step, : step + 1], strike, option_type), out=row)
+
+    return asset_prices, option_values
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+"""Build the optional ahead-of-time compiled kernels with Numba.
+
+    python build_kernels.py
+
+This writes the ``fast_kernels`` extension next to this file. It exports
+``crr_vanilla``, a loop version of the Cox-Ross-Rubinstein sweep with the same
+arguments as :func:`binomial_c.crr_price`, and ``mc_vanilla``, the Monte Carlo
+block kernel of :mod:`mc_kernel` compiled serially. The extension only needs
+NumPy at run time, so the compiled paths work without Numba installed and
+without JIT compilation on first use. Numba is needed to build it.
+"""
+from math import exp, sqrt
+
+import numpy as np
+from numba.pycc import CC
+from numba.pycc import compiler as pycc_compiler
+
+import mc_kernel
+
+
+class _NumpyErrorFlags(pycc_compiler.Flags):
+    """Compile exports with NumPy's error model, as ``mc_kernel._run`` is jitted."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.error_model = "numpy"
+
+
+# ``CC.export`` takes no compiler options, so the flags it builds are swapped.
+pycc_compiler.Flags = _NumpyErrorFlags
+
+cc = CC("fast_kernels")
+
+
+@cc.export("crr_vanilla", "f8(f8, f8, f8, f8, f8, i4, b1, b1, f8)")
+def crr_vanilla(spot, strike, maturity, rate, volatility, steps, american, is_call, dividend):
+    dt = maturity / steps
+    up = exp(volatility * sqrt(dt))
+    down = 1.0 / up
+    probability = (exp((rate - dividend) * dt) - down) / (up - down)
+    discount = exp(-rate * dt)
+    p_up = discount * probability
+    p_dn = discount - p_up
+    values = np.empty(steps + 1)
+    prices = np.empty(steps + 1)
+
+    # Terminal layer: node j has seen j up moves and steps - j down moves.
+    prices[0] = spot * down**steps
+    for j in range(1, steps + 1):
+        prices[j] = prices[j - 1] * up * up
+    for j in range(steps + 1):
+        intrinsic = prices[j] - strike if is_call else strike - prices[j]
+        values[j] = max(intrinsic, 0.0)
+
+    for step in range(steps - 1, -1, -1):
+        for j in range(step + 1):
+            values[j] = p_up * values[j + 1] + p_dn * values[j]
+            if american:
+                # Moving back one step multiplies every remaining node price by ``up``.
+                prices[j] = prices[j] * up
+                intrinsic = prices[j] - strike if is_call else strike - prices[j]
+                values[j] = max(values[j], intrinsic)
+
+    return values[0]
+
+
+# Ahead-of-time compilation is serial, so ``prange`` in the kernel runs as ``range``.
+cc.export(
+    "mc_vanilla",
+    "void(f8, f8, f8, i8, i8, u4[:], i8, f8, i4[:], f8[:], b1, f8, f8, f8[:, :], f8[:, :], f8[:])",
+)(mc_kernel._run.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,179 @@
+"""CUDA Monte Carlo kernel for standard payoffs.
+
+Every GPU thread simulates one path, or one antithetic pair, with its own
+xoroshiro128+ generator state, and writes a single value that is then summed on
+the device with ``cuda.reduce``. Payoff codes are shared with :mod:`mc_kernel`.
+
+This backend needs Numba and a CUDA-capable GPU; ``CUDA_AVAILABLE`` tells callers
+whether it can run.
+"""
+from __future__ import annotations
+
+from math import exp
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from mc_kernel import ASIAN_CALL, ASIAN_PUT, CALL, LOOKBACK_CALL, PAYOFF_CODES, PUT
+
+try:
+    from numba import cuda
+    from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_normal_float64
+except ImportError:  # pragma: no cover - optional dependency
+    CUDA_AVAILABLE = False
+else:
+    CUDA_AVAILABLE = cuda.is_available()
+
+MIN_PATHS = 100_000
+THREADS_PER_BLOCK = 256
+
+
+if CUDA_AVAILABLE:
+
+    @cuda.jit(device=True, inline=True)
+    def _payoff(code, strike, price, mean, high, low):
+        if code == CALL:
+            return max(price - strike, 0.0)
+        if code == PUT:
+            return max(strike - price, 0.0)
+        if code == ASIAN_CALL:
+            return max(mean - strike, 0.0)
+        if code == ASIAN_PUT:
+            return max(strike - mean, 0.0)
+        if code == LOOKBACK_CALL:
+            return max(high - strike, 0.0)
+        return max(strike - low, 0.0)
+
+    @cuda.jit
+    def _run(
+        rng_states,
+        spot,
+        drift,
+        diffusion,
+        steps,
+        paths,
+        code,
+        strike,
+        antithetic,
+        beta,
+        forward,
+        totals,
+        units,
+        squares,
+        samples,
+        sample_payoffs,
+    ):
+        unit = cuda.grid(1)
+        if unit >= totals.size:
+            return
+        n_samples = samples.shape[0]
+        i = 2 * unit if antithetic else unit
+        mirror = antithetic and i + 1 < paths
+
+        price = spot
+        path_sum = spot
+        high = spot
+        low = spot
+        mirror_price = spot
+        mirror_sum = spot
+        mirror_high = spot
+        mirror_low = spot
+        if i < n_samples:
+            samples[i, 0] = spot
+        if mirror and i + 1 < n_samples:
+            samples[i + 1, 0] = spot
+        for t in range(steps):
+            shock = diffusion * xoroshiro128p_normal_float64(rng_states, unit)
+            price *= exp(drift + shock)
+            path_sum += price
+            high = max(high, price)
+            low = min(low, price)
+            if i < n_samples:
+                samples[i, t + 1] = price
+            if mirror:
+                mirror_price *= exp(drift - shock)
+                mirror_sum += mirror_price
+                mirror_high = max(mirror_high, mirror_price)
+                mirror_low = min(mirror_low, mirror_price)
+                if i + 1 < n_samples:
+                    samples[i + 1, t + 1] = mirror_price
+
+        payoff = _payoff(code, strike, price, path_sum / (steps + 1), high, low)
+        if i < n_samples:
+            sample_payoffs[i] = payoff
+        value = payoff - beta * (price - forward)
+        total = value
+        if mirror:
+            payoff = _payoff(code, strike, mirror_price, mirror_sum / (steps + 1), mirror_high, mirror_low)
+            if i + 1 < n_samples:
+                sample_payoffs[i + 1] = payoff
+            mirror_value = payoff - beta * (mirror_price - forward)
+            total += mirror_value
+            value = 0.5 * (value + mirror_value)
+        totals[unit] = total
+        units[unit] = value
+        squares[unit] = value * value
+
+    _sum_reduce = cuda.reduce(lambda a, b: a + b)
+
+
+def run(
+    *,
+    spot: float,
+    drift: float,
+    diffusion: float,
+    steps: int,
+    paths: int,
+    kind: Optional[str],
+    strike: float,
+    sample_size: int,
+    antithetic: bool = False,
+    beta: float = 0.0,
+    forward: float = 0.0,
+    seed: Union[None, int, np.random.SeedSequence] = None,
+    bytecode: Optional[object] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Simulate ``paths`` GBM paths on the GPU.
+
+    Takes the same arguments and returns the same ``(sums, sample_paths,
+    sample_payoffs)`` triple as :func:`mc_kernel.run`, except that bytecode
+    payoffs are not supported.
+    """
+
+    if not CUDA_AVAILABLE:
+        raise RuntimeError("The cuda backend requires Numba and a CUDA-capable GPU.")
+    if bytecode is not None:
+        raise RuntimeError("The cuda backend only supports call, put, Asian and lookback payoffs.")
+
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    n_units = (paths + 1) // 2 if antithetic else paths
+    n_samples = min(sample_size, paths)
+    rng_states = create_xoroshiro128p_states(n_units, seed=int(seed.generate_state(1, np.uint64)[0]))
+    totals = cuda.device_array(n_units)
+    units = cuda.device_array(n_units)
+    squares = cuda.device_array(n_units)
+    samples = cuda.device_array((n_samples, steps + 1))
+    sample_payoffs = cuda.device_array(n_samples)
+
+    blocks = (n_units + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+    _run[blocks, THREADS_PER_BLOCK](
+        rng_states,
+        float(spot),
+        float(drift),
+        float(diffusion),
+        steps,
+        paths,
+        PAYOFF_CODES[kind],
+        float(strike),
+        bool(antithetic),
+        float(beta),
+        float(forward),
+        totals,
+        units,
+        squares,
+        samples,
+        sample_payoffs,
+    )
+    sums = np.array([_sum_reduce(totals), _sum_reduce(units), _sum_reduce(squares), n_units], dtype=float)
+    return sums, samples.copy_to_host(), sample_payoffs.copy_to_host()
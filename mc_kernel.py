@@ -0,0 +1,242 @@
+"""Numba kernels for Monte Carlo pricing of standard payoffs.
+
+The kernel never materializes the full path matrix: each path lives in a few local
+variables and only running sums of its payoff are kept, plus the first few paths
+as a sample. Paths are split into fixed-size blocks that run in parallel; every
+block reseeds the thread-local generator and reduces into its own row of sums, so
+results do not depend on the thread count. Besides the standard payoffs, the
+kernel runs any payoff lowered by :mod:`payoff_bytecode`.
+
+Numba is an optional dependency; ``NUMBA_AVAILABLE`` tells callers whether the
+kernel can run. ``python build_kernels.py`` also compiles the kernel ahead of time
+into the ``fast_kernels`` extension, which runs without Numba and without JIT
+warm-up but on a single thread. :func:`run` uses it when the JIT kernel would
+not run in parallel either, and it gives the same results as the JIT kernel.
+Callers choosing a backend automatically should check :func:`runs_in_parallel`:
+the serial kernel is slower than the batched NumPy simulation.
+"""
+from __future__ import annotations
+
+import threading
+from math import exp
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+import payoff_bytecode
+
+try:
+    from numba import config, njit, prange
+except ImportError:  # pragma: no cover - optional dependency
+    _JIT_AVAILABLE = False
+else:
+    _JIT_AVAILABLE = True
+
+try:
+    from fast_kernels import mc_vanilla as _prebuilt_run
+except ImportError:  # pragma: no cover - optional compiled extension
+    _prebuilt_run = None
+
+NUMBA_AVAILABLE = _JIT_AVAILABLE or _prebuilt_run is not None
+
+CALL = 0
+PUT = 1
+ASIAN_CALL = 2
+ASIAN_PUT = 3
+LOOKBACK_CALL = 4
+LOOKBACK_PUT = 5
+BYTECODE = 6
+
+PAYOFF_CODES = {
+    "call": CALL,
+    "put": PUT,
+    "asian_call": ASIAN_CALL,
+    "asian_put": ASIAN_PUT,
+    "lookback_call": LOOKBACK_CALL,
+    "lookback_put": LOOKBACK_PUT,
+}
+
+BLOCK_SIZE = 4096
+
+# Fast-math flags without ``nnan``/``ninf``, so that bytecode payoffs can still
+# report division by zero and invalid arguments as non-finite sums, and without
+# ``arcp``/``contract``, whose reciprocals and fused multiply-adds would round
+# differently from the prebuilt kernel in ``fast_kernels``.
+_FASTMATH = {"nsz", "afn", "reassoc"}
+# Numba's fallback ``workqueue`` threading layer aborts the process when parallel
+# kernels are launched from several threads at once (e.g. a threaded web server),
+# so launches are serialized. Each launch already uses every core.
+_LAUNCH_LOCK = threading.Lock()
+_NO_OPS = np.empty(0, dtype=np.int32)
+_NO_CONSTS = np.empty(0)
+
+
+if _JIT_AVAILABLE:
+
+    @njit(cache=True, fastmath=_FASTMATH, inline="always")
+    def _payoff(code, strike, ops, consts, price, mean, high, low):
+        if code == BYTECODE:
+            return payoff_bytecode.evaluate(ops, consts, price, mean, high, low)
+        if code == CALL:
+            return max(price - strike, 0.0)
+        if code == PUT:
+            return max(strike - price, 0.0)
+        if code == ASIAN_CALL:
+            return max(mean - strike, 0.0)
+        if code == ASIAN_PUT:
+            return max(strike - mean, 0.0)
+        if code == LOOKBACK_CALL:
+            return max(high - strike, 0.0)
+        return max(strike - low, 0.0)
+
+    # NumPy's error model turns division by zero in bytecode payoffs into inf or
+    # nan instead of a ZeroDivisionError raised from inside the kernel.
+    @njit(parallel=True, fastmath=_FASTMATH, error_model="numpy", cache=True)
+    def _run(
+        spot,
+        drift,
+        diffusion,
+        steps,
+        paths,
+        block_seeds,
+        code,
+        strike,
+        ops,
+        consts,
+        antithetic,
+        beta,
+        forward,
+        block_sums,
+        samples,
+        sample_payoffs,
+    ):
+        n_samples = samples.shape[0]
+        stride = 2 if antithetic else 1
+        for block in prange(block_seeds.shape[0]):
+            np.random.seed(block_seeds[block])
+            start = block * BLOCK_SIZE
+            stop = min(start + BLOCK_SIZE, paths)
+            total = 0.0
+            unit_sum = 0.0
+            unit_sumsq = 0.0
+            units = 0
+            for i in range(start, stop, stride):
+                # With antithetic variates, path i + 1 mirrors path i and the pair
+                # counts as one independent sample.
+                mirror = antithetic and i + 1 < stop
+                price = spot
+                path_sum = spot
+                high = spot
+                low = spot
+                mirror_price = spot
+                mirror_sum = spot
+                mirror_high = spot
+                mirror_low = spot
+                if i < n_samples:
+                    samples[i, 0] = spot
+                if mirror and i + 1 < n_samples:
+                    samples[i + 1, 0] = spot
+                for t in range(steps):
+                    shock = diffusion * np.random.standard_normal()
+                    price *= exp(drift + shock)
+                    path_sum += price
+                    high = max(high, price)
+                    low = min(low, price)
+                    if i < n_samples:
+                        samples[i, t + 1] = price
+                    if mirror:
+                        mirror_price *= exp(drift - shock)
+                        mirror_sum += mirror_price
+                        mirror_high = max(mirror_high, mirror_price)
+                        mirror_low = min(mirror_low, mirror_price)
+                        if i + 1 < n_samples:
+                            samples[i + 1, t + 1] = mirror_price
+                payoff = _payoff(code, strike, ops, consts, price, path_sum / (steps + 1), high, low)
+                if i < n_samples:
+                    sample_payoffs[i] = payoff
+                value = payoff - beta * (price - forward)
+                total += value
+                if mirror:
+                    payoff = _payoff(code, strike, ops, consts, mirror_price, mirror_sum / (steps + 1), mirror_high, mirror_low)
+                    if i + 1 < n_samples:
+                        sample_payoffs[i + 1] = payoff
+                    mirror_value = payoff - beta * (mirror_price - forward)
+                    total += mirror_value
+                    value = 0.5 * (value + mirror_value)
+                unit_sum += value
+                unit_sumsq += value * value
+                units += 1
+            block_sums[block, 0] = total
+            block_sums[block, 1] = unit_sum
+            block_sums[block, 2] = unit_sumsq
+            block_sums[block, 3] = units
+
+
+def runs_in_parallel() -> bool:
+    """Whether :func:`run` spreads its blocks over more than one thread."""
+
+    return _JIT_AVAILABLE and config.NUMBA_NUM_THREADS > 1
+
+
+def run(
+    *,
+    spot: float,
+    drift: float,
+    diffusion: float,
+    steps: int,
+    paths: int,
+    kind: Optional[str],
+    strike: float,
+    sample_size: int,
+    antithetic: bool = False,
+    beta: float = 0.0,
+    forward: float = 0.0,
+    seed: Union[None, int, np.random.SeedSequence] = None,
+    bytecode: Optional[payoff_bytecode.BytecodePayoff] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Simulate ``paths`` GBM paths and return ``(sums, sample_paths, sample_payoffs)``.
+
+    ``kind`` is a key of :data:`PAYOFF_CODES`; with ``bytecode`` it is ignored and
+    the payoff is interpreted from the program instead. Each path contributes the value
+    ``payoff - beta * (terminal_price - forward)``; ``sums`` holds the total of these
+    values followed by the sum, sum of squares and count of independent samples
+    (antithetic pairs count once). ``sample_paths`` holds the first ``sample_size``
+    paths with the spot price in the first column and ``sample_payoffs`` their raw
+    payoffs. With ``antithetic`` every even path is followed by its mirror image.
+    """
+
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("The numba backend requires the 'numba' package.")
+    kernel = _run if _prebuilt_run is None or runs_in_parallel() else _prebuilt_run
+
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    n_blocks = (paths + BLOCK_SIZE - 1) // BLOCK_SIZE
+    block_seeds = seed.generate_state(n_blocks)
+    block_sums = np.zeros((n_blocks, 4))
+    if bytecode is not None:
+        code, ops, consts = BYTECODE, bytecode.ops, bytecode.consts
+    else:
+        code, ops, consts = PAYOFF_CODES[kind], _NO_OPS, _NO_CONSTS
+    samples = np.empty((min(sample_size, paths), steps + 1))
+    sample_payoffs = np.empty(len(samples))
+    with _LAUNCH_LOCK:
+        kernel(
+            float(spot),
+            float(drift),
+            float(diffusion),
+            steps,
+            paths,
+            block_seeds,
+            code,
+            float(strike),
+            ops,
+            consts,
+            bool(antithetic),
+            float(beta),
+            float(forward),
+            block_sums,
+            samples,
+            sample_payoffs,
+        )
+    return block_sums.sum(axis=0), samples, sample_payoffs
@@ -4,9 +4,20 @@ from __future__ import annotations
 import ast
 import builtins
 import math
+import os
+import pickle
+import warnings
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from random import gauss
-from typing import Callable, List, Sequence
+from functools import lru_cache
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import mc_cuda
+import mc_kernel
+import payoff_bytecode
+import payoff_codegen
 
 
 def _validate_positive(name: str, value: float) -> None:
@@ -65,7 +76,7 @@ class _ExpressionValidator(ast.NodeVisitor):
     )
 
     _allowed_names = {"price", "path"}
-    _helper_functions = {"max", "min"}
+    _helper_functions = {"max", "min", "sum", "len"}
     _allowed_functions = {name for name in dir(math) if not name.startswith("__")}
     _allowed_functions.update(_helper_functions)
 
@@ -94,15 +105,346 @@ class _ExpressionValidator(ast.NodeVisitor):
         self.generic_visit(node)
 
 
-def payoff_from_expression(expression: str) -> Callable[[float, Sequence[float]], float]:
+_NUMPY_EQUIVALENTS = {
+    "acos": "arccos",
+    "acosh": "arccosh",
+    "asin": "arcsin",
+    "asinh": "arcsinh",
+    "atan": "arctan",
+    "atan2": "arctan2",
+    "atanh": "arctanh",
+    "ceil": "ceil",
+    "copysign": "copysign",
+    "cos": "cos",
+    "cosh": "cosh",
+    "exp": "exp",
+    "expm1": "expm1",
+    "fabs": "abs",
+    "floor": "floor",
+    "fmod": "fmod",
+    "hypot": "hypot",
+    "isfinite": "isfinite",
+    "isinf": "isinf",
+    "isnan": "isnan",
+    "log10": "log10",
+    "log1p": "log1p",
+    "log2": "log2",
+    "pow": "power",
+    "sin": "sin",
+    "sinh": "sinh",
+    "sqrt": "sqrt",
+    "tan": "tan",
+    "tanh": "tanh",
+    "trunc": "trunc",
+}
+
+
+class _NotVectorizable(Exception):
+    """Raised when an expression has no NumPy translation."""
+
+
+def _vector_len(values: np.ndarray) -> int:
+    return np.shape(values)[-1]
+
+
+def _is_path(node: ast.AST) -> bool:
+    return isinstance(node, ast.Name) and node.id == "path"
+
+
+def _is_scalar_index(node: ast.AST) -> bool:
+    """Whether an index is the same for every path, i.e. only uses ``len(path)``."""
+
+    lengths = {
+        id(call.args[0])
+        for call in ast.walk(node)
+        if isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id == "len" and call.args
+    }
+    return all(
+        not (isinstance(name, ast.Name) and (name.id == "price" or (name.id == "path" and id(name) not in lengths)))
+        for name in ast.walk(node)
+    )
+
+
+class _VectorizingTransformer(ast.NodeTransformer):
+    """Rewrite a validated payoff AST to operate on whole arrays of paths.
+
+    ``price`` becomes a ``(paths,)`` vector and ``path`` a ``(paths, steps + 1)``
+    matrix, so reductions over a path run along the last axis. ``path`` may only
+    be reduced, sliced inside a reduction or indexed with a path-independent
+    index: anything else means something different for a list of floats than for
+    a matrix and is left to per-path evaluation.
+    """
+
+    @staticmethod
+    def _np(attr: str) -> ast.Attribute:
+        return ast.Attribute(value=ast.Name(id="_np", ctx=ast.Load()), attr=attr, ctx=ast.Load())
+
+    def _np_call(self, attr: str, *args: ast.expr, axis: Optional[int] = None) -> ast.Call:
+        keywords = []
+        if axis is not None:
+            keywords.append(ast.keyword(arg="axis", value=ast.Constant(axis)))
+        return ast.Call(func=self._np(attr), args=list(args), keywords=keywords)
+
+    def _fold(self, attr: str, args: Sequence[ast.expr]) -> ast.expr:
+        result = args[0]
+        for arg in args[1:]:
+            result = self._np_call(attr, result, arg)
+        return result
+
+    def _path_sequence(self, node: ast.AST) -> ast.expr:
+        """Translate ``path`` or a slice of it, the only sequences a reduction accepts."""
+
+        if _is_path(node):
+            return node
+        if isinstance(node, ast.Subscript) and _is_path(node.value) and isinstance(node.slice, ast.Slice):
+            if not _is_scalar_index(node.slice):
+                raise _NotVectorizable("path-dependent slice")
+            bounds = self.visit(node.slice)
+            return ast.Subscript(
+                value=node.value, slice=ast.Tuple(elts=[ast.Constant(Ellipsis), bounds], ctx=ast.Load()), ctx=ast.Load()
+            )
+        raise _NotVectorizable("reduction over something other than path")
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if _is_path(node):
+            raise _NotVectorizable("path used as a value")
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if node.keywords:
+            raise _NotVectorizable("keyword arguments")
+        name = node.func.attr if isinstance(node.func, ast.Attribute) else node.func.id
+        reduction = name == "fsum" or (name in ("max", "min", "sum", "len") and isinstance(node.func, ast.Name))
+        if reduction and len(node.args) == 1 and not isinstance(node.args[0], (ast.List, ast.Tuple)):
+            sequence = self._path_sequence(node.args[0])
+            if name == "len":
+                return ast.Call(func=ast.Name(id="_vector_len", ctx=ast.Load()), args=[sequence], keywords=[])
+            return self._np_call("sum" if name == "fsum" else name, sequence, axis=-1)
+        args = [self.visit(arg) for arg in node.args]
+
+        if name in ("max", "min", "sum") and isinstance(node.func, ast.Name):
+            if len(args) == 1:
+                args = args[0].elts
+            if not args:
+                raise _NotVectorizable(f"{name}() without arguments")
+            if name == "sum":
+                return self._fold("add", args)
+            return self._fold("maximum" if name == "max" else "minimum", args)
+        if reduction:
+            raise _NotVectorizable(f"{name}() of a literal sequence")
+        if name == "log" and len(args) in (1, 2):
+            logarithm = self._np_call("log", args[0])
+            if len(args) == 2:
+                return ast.BinOp(left=logarithm, op=ast.Div(), right=self._np_call("log", args[1]))
+            return logarithm
+        if name in _NUMPY_EQUIVALENTS:
+            return self._np_call(_NUMPY_EQUIVALENTS[name], *args)
+        raise _NotVectorizable(f"no NumPy equivalent for {name}")
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        if not _is_path(node.value):
+            raise _NotVectorizable("indexing something other than path")
+        index = node.slice.value if isinstance(node.slice, ast.Index) else node.slice
+        if isinstance(index, ast.Slice) or not _is_scalar_index(index):
+            raise _NotVectorizable("slice or path-dependent index")
+        # Index along the time axis, leaving the path axis untouched.
+        node.slice = ast.Tuple(elts=[ast.Constant(Ellipsis), self.visit(index)], ctx=ast.Load())
+        return node
+
+    def visit_IfExp(self, node: ast.IfExp) -> ast.AST:
+        self.generic_visit(node)
+        return self._np_call("where", node.test, node.body, node.orelse)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        # ``a and b`` yields ``b`` where ``a`` is truthy and ``a`` elsewhere; ``or``
+        # is the mirror image. Both operands are evaluated on arrays.
+        values = [self.visit(value) for value in node.values]
+        result = values[-1]
+        for value in reversed(values[:-1]):
+            if isinstance(node.op, ast.And):
+                result = self._np_call("where", value, result, value)
+            else:
+                result = self._np_call("where", value, value, result)
+        return result
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        operands = [node.left, *node.comparators]
+        pairs = [
+            ast.Compare(left=left, ops=[op], comparators=[right])
+            for left, op, right in zip(operands, node.ops, operands[1:])
+        ]
+        return self._fold("logical_and", pairs)
+
+
+@dataclass(frozen=True)
+class PayoffTemplate:
+    """A standard payoff recognised in an expression, e.g. ``max(price - K, 0)``.
+
+    ``kind`` is one of ``call``, ``put``, ``asian_call``, ``asian_put``,
+    ``lookback_call`` and ``lookback_put``.
+    """
+
+    kind: str
+    strike: float
+
+
+_CALL_KINDS = {"price": "call", "mean": "asian_call", "max": "lookback_call"}
+_PUT_KINDS = {"price": "put", "mean": "asian_put", "min": "lookback_put"}
+
+
+def _constant(node: ast.AST) -> Optional[float]:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return float(node.value)
+    return None
+
+
+def _is_path_call(node: ast.AST, name: str) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == name
+        and len(node.args) == 1
+        and not node.keywords
+        and isinstance(node.args[0], ast.Name)
+        and node.args[0].id == "path"
+    )
+
+
+def _path_measure(node: ast.AST) -> Optional[str]:
+    """Name the path statistic ``node`` computes, if it is a recognised one."""
+
+    if isinstance(node, ast.Name) and node.id == "price":
+        return "price"
+    if _is_path_call(node, "max"):
+        return "max"
+    if _is_path_call(node, "min"):
+        return "min"
+    if (
+        isinstance(node, ast.BinOp)
+        and isinstance(node.op, ast.Div)
+        and _is_path_call(node.left, "sum")
+        and _is_path_call(node.right, "len")
+    ):
+        return "mean"
+    return None
+
+
+def _match_template(syntax_tree: ast.Expression) -> Optional[PayoffTemplate]:
+    """Recognise ``max(<measure> - K, 0)`` and ``max(K - <measure>, 0)`` payoffs."""
+
+    node = syntax_tree.body
+    if not (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == "max"
+        and len(node.args) == 2
+        and not node.keywords
+    ):
+        return None
+
+    spread, floor = node.args
+    if _constant(spread) == 0:
+        spread, floor = floor, spread
+    if _constant(floor) != 0 or not (isinstance(spread, ast.BinOp) and isinstance(spread.op, ast.Sub)):
+        return None
+
+    strike = _constant(spread.right)
+    if strike is not None and _path_measure(spread.left) in _CALL_KINDS:
+        return PayoffTemplate(kind=_CALL_KINDS[_path_measure(spread.left)], strike=strike)
+    strike = _constant(spread.left)
+    if strike is not None and _path_measure(spread.right) in _PUT_KINDS:
+        return PayoffTemplate(kind=_PUT_KINDS[_path_measure(spread.right)], strike=strike)
+    return None
+
+
+def _template_functions(
+    template: PayoffTemplate,
+) -> Tuple[Callable[[float, Sequence[float]], float], Callable[[np.ndarray, np.ndarray], np.ndarray]]:
+    """Return scalar and vectorized closures for a standard payoff, bypassing ``eval``."""
+
+    strike = template.strike
+    kind = template.kind
+    if kind == "call":
+        return (
+            lambda price, path: max(price - strike, 0.0),
+            lambda prices, paths: np.maximum(prices - strike, 0.0),
+        )
+    if kind == "put":
+        return (
+            lambda price, path: max(strike - price, 0.0),
+            lambda prices, paths: np.maximum(strike - prices, 0.0),
+        )
+    if kind == "asian_call":
+        return (
+            lambda price, path: max(sum(path) / len(path) - strike, 0.0),
+            lambda prices, paths: np.maximum(paths.mean(axis=-1) - strike, 0.0),
+        )
+    if kind == "asian_put":
+        return (
+            lambda price, path: max(strike - sum(path) / len(path), 0.0),
+            lambda prices, paths: np.maximum(strike - paths.mean(axis=-1), 0.0),
+        )
+    if kind == "lookback_call":
+        return (
+            lambda price, path: max(max(path) - strike, 0.0),
+            lambda prices, paths: np.maximum(paths.max(axis=-1) - strike, 0.0),
+        )
+    return (
+        lambda price, path: max(strike - min(path), 0.0),
+        lambda prices, paths: np.maximum(strike - paths.min(axis=-1), 0.0),
+    )
+
+
+@dataclass(frozen=True)
+class CompiledPayoff:
+    """Payoff compiled from an expression.
+
+    Calling the object evaluates a single path. ``vector`` evaluates every path at
+    once from a ``(paths,)`` terminal price vector and a ``(paths, steps + 1)`` path
+    matrix, and is ``None`` when the expression has no NumPy translation.
+    ``template`` is set when the expression is a standard payoff; the compiled
+    kernels in :mod:`mc_kernel` then price it without evaluating the expression and
+    both forms are plain closures. Otherwise ``native`` is set when
+    :mod:`payoff_codegen` could compile the expression to machine code, and
+    ``bytecode`` when :mod:`payoff_bytecode` could lower it for the Numba
+    interpreter, which also lets :mod:`mc_kernel` price it. ``uses_path`` is false
+    when the expression only reads ``price``, so the simulation can skip building
+    full paths.
+    """
+
+    expression: str
+    scalar: Callable[[float, Sequence[float]], float]
+    vector: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None
+    template: Optional[PayoffTemplate] = None
+    native: Optional[payoff_codegen.NativePayoff] = None
+    bytecode: Optional[payoff_bytecode.BytecodePayoff] = None
+    uses_path: bool = True
+
+    def __call__(self, price: float, path: Sequence[float]) -> float:
+        return self.scalar(price, path)
+
+
+def payoff_from_expression(expression: str) -> CompiledPayoff:
     """Compile a user-provided expression into a payoff function.
 
     The expression can use:
     - ``price``: terminal asset price.
     - ``path``: full price path as a list of floats.
-    - Functions from the :mod:`math` module such as ``max``, ``exp``, and ``sqrt``.
+    - Functions from the :mod:`math` module such as ``exp`` and ``sqrt``, plus
+      ``max``, ``min``, ``sum`` and ``len``.
+
+    Compiled payoffs are immutable and cached, so repeated requests for the same
+    expression skip parsing, validation and compilation.
     """
 
+    return _compile(expression.strip())
+
+
+@lru_cache(maxsize=256)
+def _compile(expression: str) -> CompiledPayoff:
     try:
         syntax_tree = ast.parse(expression, mode="eval")
     except SyntaxError as exc:  # pragma: no cover - defensive branch
@@ -120,14 +462,416 @@ def payoff_from_expression(expression: str) -> Callable[[float, Sequence[float]]
     def payoff(price: float, path: Sequence[float]) -> float:
         return float(eval(compiled, allowed_globals, {"price": price, "path": path}))
 
-    return payoff
+    uses_path = any(isinstance(node, ast.Name) and node.id == "path" for node in ast.walk(syntax_tree))
+
+    template = _match_template(syntax_tree)
+    if template is not None:
+        scalar, vector = _template_functions(template)
+        return CompiledPayoff(
+            expression=expression, scalar=scalar, vector=vector, template=template, uses_path=uses_path
+        )
+
+    native = payoff_codegen.compile_native(expression)
+    bytecode = payoff_bytecode.compile_bytecode(expression)
+
+    try:
+        vector_tree = _VectorizingTransformer().visit(ast.parse(expression, mode="eval"))
+    except _NotVectorizable:
+        return CompiledPayoff(
+            expression=expression, scalar=payoff, native=native, bytecode=bytecode, uses_path=uses_path
+        )
+
+    vector_compiled = compile(ast.fix_missing_locations(vector_tree), filename="<payoff>", mode="eval")
+    vector_globals = dict(allowed_globals, _np=np, _vector_len=_vector_len)
+
+    constant = not uses_path and not any(
+        isinstance(node, ast.Name) and node.id == "price" for node in ast.walk(syntax_tree)
+    )
+
+    def vector_payoff(prices: np.ndarray, paths: np.ndarray) -> np.ndarray:
+        values = eval(vector_compiled, vector_globals, {"price": prices, "path": paths})
+        if constant:
+            # Only an expression without free names may yield one value for all paths.
+            return np.full(np.shape(prices), values, dtype=float)
+        return values
+
+    return CompiledPayoff(
+        expression=expression,
+        scalar=payoff,
+        vector=vector_payoff,
+        native=native,
+        bytecode=bytecode,
+        uses_path=uses_path,
+    )
+
+
+def _evaluate_payoffs(
+    payoff: Callable[[float, Sequence[float]], float],
+    terminal_prices: np.ndarray,
+    simulated_paths: np.ndarray,
+) -> np.ndarray:
+    """Evaluate ``payoff`` on every path, using its fastest available form.
+
+    Native code is tried first, then bytecode, NumPy and per-path evaluation.
+    Non-finite or failing results move on to the next form, so errors are always
+    reported by the per-path evaluation.
+    """
+
+    for compiled in (getattr(payoff, "native", None), getattr(payoff, "bytecode", None)):
+        if compiled is not None:
+            values = compiled.vector(terminal_prices, simulated_paths)
+            if np.isfinite(values).all():
+                return values
+
+    vector_payoff = getattr(payoff, "vector", None)
+    if vector_payoff is not None:
+        try:
+            # Floating point errors fall back to the scalar path so that users see
+            # the same exceptions as with per-path evaluation.
+            with np.errstate(divide="raise", over="raise", invalid="raise"):
+                values = np.asarray(vector_payoff(terminal_prices, simulated_paths), dtype=float)
+        except (ArithmeticError, IndexError, TypeError, ValueError):
+            values = None
+        if values is not None and values.shape == terminal_prices.shape:
+            return values
+
+    # Plain floats and lists, so that errors raise as they would for a single path
+    # instead of turning into NumPy warnings and non-finite values.
+    return np.fromiter(
+        (payoff(float(price), path.tolist()) for price, path in zip(terminal_prices, simulated_paths)),
+        dtype=float,
+        count=len(terminal_prices),
+    )
+
+
+_BATCH_ELEMENTS = 1 << 20
+_PILOT_PATHS = 1000
+
+
+@lru_cache(maxsize=64)
+def _brownian_bridge_plan(steps: int) -> Tuple[Tuple[int, int, int, float, float, float], ...]:
+    """Order in which a Brownian bridge fills in the points of a path.
+
+    Times are measured in steps. Each entry ``(point, left, right, left_weight,
+    right_weight, scale)`` sets ``W[point]`` from the already known ``W[left]`` and
+    ``W[right]`` plus ``scale`` times the next normal draw. The first entry fixes the
+    terminal point, then intervals are halved breadth first so that the leading
+    (best distributed) quasi-random coordinates decide the coarse path shape.
+    """
+
+    plan = [(steps, 0, 0, 0.0, 0.0, math.sqrt(steps))]
+    intervals = [(0, steps)]
+    for left, right in intervals:
+        if right - left < 2:
+            continue
+        point = (left + right) // 2
+        width = right - left
+        plan.append(
+            (
+                point,
+                left,
+                right,
+                (right - point) / width,
+                (point - left) / width,
+                math.sqrt((point - left) * (right - point) / width),
+            )
+        )
+        intervals.extend([(left, point), (point, right)])
+    return tuple(plan)
+
+
+def _sobol_shocks(sampler: Any, paths: int, steps: int) -> np.ndarray:
+    """Turn scrambled Sobol' points into standard normal shocks via a Brownian bridge."""
+
+    from scipy.stats import norm
+
+    with warnings.catch_warnings():
+        # Sobol' balance is best for powers of two, but any path count is valid.
+        warnings.filterwarnings("ignore", message=".*balance properties of Sobol", category=UserWarning)
+        uniforms = sampler.random(paths)
+    normals = norm.ppf(np.clip(uniforms, 1e-12, 1 - 1e-12))
+
+    brownian = np.zeros((paths, steps + 1))
+    for column, (point, left, right, left_weight, right_weight, scale) in enumerate(_brownian_bridge_plan(steps)):
+        brownian[:, point] = (
+            left_weight * brownian[:, left] + right_weight * brownian[:, right] + scale * normals[:, column]
+        )
+    return np.diff(brownian, axis=1)
+
+
+def _simulate_paths(
+    sampler: Any,
+    *,
+    spot: float,
+    drift: float,
+    diffusion: float,
+    steps: int,
+    paths: int,
+    antithetic: bool,
+    keep_paths: Optional[int] = None,
+    dtype: str = "float64",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate GBM paths and return their terminal prices and the path matrix.
+
+    ``sampler`` is either a NumPy generator or a SciPy Sobol' engine with one
+    dimension per step. With ``antithetic`` the second half of the paths reuses the
+    shocks of the first half with flipped signs. The matrix has shape
+    ``(paths, steps + 1)`` with the spot price in the first column; with
+    ``keep_paths`` only its first ``keep_paths`` rows are built and the terminal
+    prices come straight from the summed shocks. Shocks and paths are stored as
+    ``dtype``.
+    """
+
+    count = (paths + 1) // 2 if antithetic else paths
+    if isinstance(sampler, np.random.Generator):
+        shocks = sampler.standard_normal((count, steps), dtype=dtype)
+    else:
+        shocks = _sobol_shocks(sampler, count, steps).astype(dtype, copy=False)
+
+    if keep_paths is None:
+        if antithetic:
+            shocks = np.concatenate([shocks, -shocks])[:paths]
+        simulated_paths = _build_paths(shocks, spot=spot, drift=drift, diffusion=diffusion)
+        return simulated_paths[:, -1], simulated_paths
+
+    log_returns = steps * drift + diffusion * shocks.sum(axis=1)
+    if antithetic:
+        log_returns = np.concatenate([log_returns, 2 * steps * drift - log_returns])[:paths]
+    rows = np.arange(min(keep_paths, paths))
+    leading = shocks[rows % count]
+    leading[rows >= count] *= -1
+    return spot * np.exp(log_returns), _build_paths(leading, spot=spot, drift=drift, diffusion=diffusion)
+
+
+def _build_paths(shocks: np.ndarray, *, spot: float, drift: float, diffusion: float) -> np.ndarray:
+    """Turn a ``(paths, steps)`` shock matrix into GBM paths starting at ``spot``."""
+
+    # Accumulate log prices in place and exponentiate once.
+    log_paths = np.empty((len(shocks), shocks.shape[1] + 1), dtype=shocks.dtype)
+    log_paths[:, 0] = math.log(spot)
+    np.multiply(shocks, diffusion, out=log_paths[:, 1:])
+    log_paths[:, 1:] += drift
+    np.cumsum(log_paths, axis=1, out=log_paths)
+    np.exp(log_paths, out=log_paths)
+    log_paths[:, 0] = spot
+    return log_paths
+
+
+def _control_beta(
+    payoff: Callable[[float, Sequence[float]], float],
+    rng: np.random.Generator,
+    *,
+    spot: float,
+    drift: float,
+    diffusion: float,
+    steps: int,
+    antithetic: bool,
+) -> float:
+    """Estimate the control variate coefficient for the terminal price from a pilot run."""
+
+    terminal_prices, pilot = _simulate_paths(
+        rng, spot=spot, drift=drift, diffusion=diffusion, steps=steps, paths=_PILOT_PATHS, antithetic=antithetic
+    )
+    payoffs = _evaluate_payoffs(payoff, terminal_prices, pilot)
+    if antithetic:
+        # The estimator averages each antithetic pair, so fit beta on pair means.
+        payoffs, terminal_prices = _pair_means(payoffs), _pair_means(terminal_prices)
+    variance = terminal_prices.var()
+    if variance == 0.0:
+        return 0.0
+    return float(np.mean((payoffs - payoffs.mean()) * (terminal_prices - terminal_prices.mean())) / variance)
+
+
+def _pair_means(values: np.ndarray) -> np.ndarray:
+    """Average antithetic pairs laid out by :func:`_simulate_paths`.
+
+    Row ``k`` pairs with row ``k + half``; an odd count leaves one path unpaired.
+    """
+
+    half = (len(values) + 1) // 2
+    paired = len(values) - half
+    return np.concatenate([0.5 * (values[:paired] + values[half:]), values[paired:half]])
+
+
+@dataclass
+class _PathStatistics:
+    """Running sums over simulated path values.
+
+    ``total`` and ``paths`` give the mean. The standard error uses independent
+    samples only, so an antithetic pair contributes the mean of its two paths.
+    """
+
+    total: float = 0.0
+    paths: int = 0
+    sample_sum: float = 0.0
+    sample_sumsq: float = 0.0
+    samples: int = 0
+
+    def add(self, values: np.ndarray, antithetic: bool) -> None:
+        """Add a batch laid out by :func:`_simulate_paths`."""
+
+        self.total += float(values.sum())
+        self.paths += len(values)
+        if antithetic:
+            values = _pair_means(values)
+        self.sample_sum += float(values.sum())
+        self.sample_sumsq += float(np.dot(values, values))
+        self.samples += len(values)
+
+    def merge(self, other: "_PathStatistics") -> None:
+        self.total += other.total
+        self.paths += other.paths
+        self.sample_sum += other.sample_sum
+        self.sample_sumsq += other.sample_sumsq
+        self.samples += other.samples
+
+    def stderr(self) -> float:
+        if self.samples < 2:
+            return 0.0
+        mean = self.sample_sum / self.samples
+        variance = max(self.sample_sumsq / self.samples - mean * mean, 0.0) * self.samples / (self.samples - 1)
+        return math.sqrt(variance / self.samples)
+
+
+def _select_kernel(
+    backend: str,
+    method: str,
+    template: Optional[PayoffTemplate],
+    bytecode: Optional[payoff_bytecode.BytecodePayoff],
+    paths: int,
+) -> Any:
+    """Return the compiled kernel module to run, or ``None`` for the NumPy backend."""
+
+    if backend == "numpy" or (backend == "auto" and (method != "mc" or (template is None and bytecode is None))):
+        return None
+    if backend == "auto":
+        if template is not None and mc_cuda.CUDA_AVAILABLE and paths >= mc_cuda.MIN_PATHS:
+            return mc_cuda
+        # The kernel draws and exponentiates one step at a time, so on a single
+        # thread the batched NumPy simulation is faster.
+        return mc_kernel if mc_kernel.runs_in_parallel() else None
+
+    if backend == "cuda" and not mc_cuda.CUDA_AVAILABLE:
+        raise ValueError("The cuda backend requires Numba and a CUDA-capable GPU.")
+    if backend == "numba" and not mc_kernel.NUMBA_AVAILABLE:
+        raise ValueError("The numba backend requires the 'numba' package.")
+    if backend == "cuda" and template is None:
+        raise ValueError("The cuda backend only supports call, put, Asian and lookback payoffs.")
+    if template is None and bytecode is None:
+        raise ValueError(
+            "The numba backend only supports payoffs built from price, the mean, max and min of path, "
+            "arithmetic, max, min, exp, log and sqrt."
+        )
+    return mc_cuda if backend == "cuda" else mc_kernel
+
+
+def _simulate_numpy(
+    payoff: Union[str, Callable[[float, Sequence[float]], float]],
+    seed: np.random.SeedSequence,
+    *,
+    offset: int,
+    paths: int,
+    spot: float,
+    drift: float,
+    diffusion: float,
+    steps: int,
+    antithetic: bool,
+    beta: float,
+    forward: float,
+    method: str,
+    sample_size: int,
+    dtype: str,
+) -> Tuple[_PathStatistics, np.ndarray, np.ndarray]:
+    """Simulate ``paths`` paths with the NumPy backend.
+
+    ``payoff`` may be an expression string so that the call can run in a worker
+    process. ``offset`` is the number of paths simulated before this chunk and must
+    be a multiple of the batch size. Batch ``k`` of the whole run always draws from
+    the ``k``-th stream spawned from ``seed``, and quasi-Monte Carlo chunks skip the
+    Sobol' points used by earlier ones, so the union of the chunks does not depend
+    on how the paths were split.
+    """
+
+    if isinstance(payoff, str):
+        payoff = payoff_from_expression(payoff)
+
+    batch_size = _batch_size(steps)
+    sampler = None
+    if method == "qmc":
+        try:
+            from scipy.stats import qmc
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ValueError("method 'qmc' requires the 'scipy' package.") from exc
+        # SciPy spawns from the generator's seed sequence, so chunks that share
+        # ``seed`` (e.g. in a thread pool) scramble from a fresh copy of it each.
+        scrambling = np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key)
+        sampler = qmc.Sobol(d=steps, scramble=True, seed=np.random.default_rng(scrambling))
+        if offset:
+            sampler.fast_forward(offset // 2 if antithetic else offset)
+
+    # Simulate in batches of bounded size, keeping only running sums and samples.
+    # Payoffs that never read the path only need the paths kept as samples.
+    uses_path = getattr(payoff, "uses_path", True)
+    stats = _PathStatistics()
+    sample_paths = sample_payoffs = None
+    for start in range(0, paths, batch_size):
+        keep_paths = None if uses_path else (sample_size if start == 0 else 0)
+        terminal_prices, simulated_paths = _simulate_paths(
+            sampler or np.random.default_rng(_spawned(seed, (offset + start) // batch_size)),
+            spot=spot,
+            drift=drift,
+            diffusion=diffusion,
+            steps=steps,
+            paths=min(batch_size, paths - start),
+            antithetic=antithetic,
+            keep_paths=keep_paths,
+            dtype=dtype,
+        )
+        payoffs = _evaluate_payoffs(
+            payoff, terminal_prices, simulated_paths if uses_path else np.empty((len(terminal_prices), 0))
+        )
+        if sample_paths is None:
+            sample_paths = simulated_paths[:sample_size].copy()
+            sample_payoffs = payoffs[:sample_size].copy()
+        # Payoffs are float64 whatever the path precision, and so are the sums.
+        stats.add(payoffs - beta * (terminal_prices.astype(float) - forward), antithetic)
+    return stats, sample_paths, sample_payoffs
+
+
+def _batch_size(steps: int) -> int:
+    return max(2, _BATCH_ELEMENTS // (steps + 1) // 2 * 2)
+
+
+def _picklable(payoff: Any) -> bool:
+    try:
+        pickle.dumps(payoff)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def _spawned(seed: np.random.SeedSequence, index: int) -> np.random.SeedSequence:
+    """Return the ``index``-th child of ``seed``, as ``seed.spawn`` would, statelessly."""
+
+    return np.random.SeedSequence(seed.entropy, spawn_key=(*seed.spawn_key, index))
 
 
 @dataclass
 class MonteCarloResult:
+    """Container for Monte Carlo pricing outputs.
+
+    Only the first few paths are kept: ``sample_paths`` has shape
+    ``(sample_size, steps + 1)`` with the spot price in the first column and
+    ``sample_payoffs`` holds their raw, undiscounted payoffs. ``stderr`` is the
+    standard error of ``price`` assuming independent samples, so it overstates the
+    error of quasi-Monte Carlo estimates.
+    """
+
     price: float
-    payoffs: List[float]
-    paths: List[List[float]]
+    stderr: float
+    n_paths: int
+    sample_paths: np.ndarray
+    sample_payoffs: np.ndarray
 
 
 def monte_carlo_option_price(
@@ -139,32 +883,170 @@ def monte_carlo_option_price(
     steps: int,
     paths: int,
     payoff: Callable[[float, Sequence[float]], float],
+    backend: str = "auto",
+    seed: Optional[int] = None,
+    antithetic: bool = True,
+    control_variate: Optional[str] = None,
+    method: str = "mc",
+    sample_size: int = 10,
+    executor: Optional[Executor] = None,
+    chunks: Optional[int] = None,
+    dtype: str = "float64",
 ) -> MonteCarloResult:
-    """Price an option with Geometric Brownian Motion using Monte Carlo simulation."""
+    """Price an option with Geometric Brownian Motion using Monte Carlo simulation.
+
+    ``backend`` selects the simulation engine: ``"numpy"`` simulates batches of
+    paths as arrays, ``"numba"`` runs the parallel CPU kernel in :mod:`mc_kernel`
+    and ``"cuda"`` the GPU kernel in :mod:`mc_cuda`. The GPU kernel only prices
+    standard payoffs (see :class:`PayoffTemplate`); the CPU kernel also prices
+    payoffs that :mod:`payoff_bytecode` can interpret. ``"auto"`` picks the GPU
+    for at least ``mc_cuda.MIN_PATHS`` paths, then the CPU kernel if Numba runs it
+    on more than one thread, whenever the payoff allows, and NumPy otherwise.
+    Passing ``seed`` makes the run reproducible for a given backend. Memory use
+    does not grow with ``paths``: only running sums and the first ``sample_size``
+    paths are kept.
+
+    Two variance reduction techniques are available. ``antithetic`` pairs every
+    path with its mirror image built from the negated shocks. ``control_variate=
+    "underlying"`` uses the discounted terminal price, whose expectation is
+    ``spot``, as a control; its coefficient is estimated from a separate pilot run.
+
+    ``method="qmc"`` replaces pseudorandom shocks with scrambled Sobol' points
+    (requires SciPy), mapped to paths with a Brownian bridge. It converges faster
+    for smooth payoffs and is only available with the NumPy backend.
+
+    ``dtype="float32"`` makes the NumPy backend store shocks, paths and sample
+    paths in single precision, which halves the memory traffic of path
+    simulation. Payoffs are still returned, summed and averaged in double
+    precision. The compiled kernels never store whole paths and ignore it.
+
+    With an ``executor`` (typically a ``ProcessPoolExecutor``), the NumPy backend
+    splits the paths into ``chunks`` pieces (default: one per CPU) that run in
+    parallel. Every fixed-size batch of paths draws from its own stream spawned
+    from ``seed`` with :meth:`numpy.random.SeedSequence.spawn`, so for a given
+    ``seed``, ``paths`` and ``steps`` the result is the same whatever the number of
+    chunks, and the same as a serial run. Compiled payoffs are sent to workers as
+    their expression and other callables are pickled; callables that cannot be
+    pickled, such as lambdas and closures, run serially in this process. The
+    compiled kernels already use every core and ignore the executor.
+    """
 
     _validate_inputs(spot, maturity, rate, volatility, steps, paths)
+    if backend not in ("auto", "numpy", "numba", "cuda"):
+        raise ValueError("backend must be 'auto', 'numpy', 'numba' or 'cuda'.")
+    if control_variate not in (None, "underlying"):
+        raise ValueError("control_variate must be None or 'underlying'.")
+    if method not in ("mc", "qmc"):
+        raise ValueError("method must be 'mc' or 'qmc'.")
+    if method == "qmc" and backend in ("numba", "cuda"):
+        raise ValueError(f"method 'qmc' is not supported by the {backend} backend.")
+    if sample_size < 0:
+        raise ValueError("sample_size must be non-negative.")
+    if dtype not in ("float64", "float32"):
+        raise ValueError("dtype must be 'float64' or 'float32'.")
 
     dt = maturity / steps
     drift = (rate - 0.5 * volatility * volatility) * dt
     diffusion = volatility * math.sqrt(dt)
+    discount_factor = math.exp(-rate * maturity)
+    forward = spot * math.exp(rate * maturity)
 
-    simulated_paths: List[List[float]] = []
-    payoffs: List[float] = []
-
-    for _ in range(paths):
-        prices = [spot]
-        price = spot
-        for _ in range(steps):
-            increment = drift + diffusion * gauss(0, 1)
-            price *= math.exp(increment)
-            prices.append(price)
-        simulated_paths.append(prices)
-        payoffs.append(payoff(price, prices))
+    pilot_seed, main_seed = np.random.SeedSequence(seed).spawn(2)
+    beta = 0.0
+    if control_variate == "underlying":
+        beta = _control_beta(
+            payoff,
+            np.random.default_rng(pilot_seed),
+            spot=spot,
+            drift=drift,
+            diffusion=diffusion,
+            steps=steps,
+            antithetic=antithetic,
+        )
 
-    discount_factor = math.exp(-rate * maturity)
-    price_estimate = discount_factor * sum(payoffs) / len(payoffs)
+    template = getattr(payoff, "template", None)
+    bytecode = getattr(payoff, "bytecode", None) if template is None else None
+    kernel = _select_kernel(backend, method, template, bytecode, paths)
+    if kernel is not None:
+        sums, sample_paths, sample_payoffs = kernel.run(
+            spot=spot,
+            drift=drift,
+            diffusion=diffusion,
+            steps=steps,
+            paths=paths,
+            kind=template.kind if template is not None else None,
+            strike=template.strike if template is not None else 0.0,
+            sample_size=sample_size,
+            antithetic=antithetic,
+            beta=beta,
+            forward=forward,
+            seed=main_seed,
+            bytecode=bytecode,
+        )
+        stats = _PathStatistics(
+            total=float(sums[0]),
+            paths=paths,
+            sample_sum=float(sums[1]),
+            sample_sumsq=float(sums[2]),
+            samples=int(sums[3]),
+        )
+        if bytecode is not None and not np.isfinite(sums).all():
+            # Bytecode turns errors such as division by zero into non-finite
+            # values; the NumPy backend reports them like any other payoff.
+            kernel = None
+    if kernel is None:
+        simulation = dict(
+            spot=spot,
+            drift=drift,
+            diffusion=diffusion,
+            steps=steps,
+            antithetic=antithetic,
+            beta=beta,
+            forward=forward,
+            method=method,
+            sample_size=sample_size,
+            dtype=dtype,
+        )
+        # Chunks are whole batches, so every chunk but the last has an even size.
+        batch_size = _batch_size(steps)
+        n_batches = -(-paths // batch_size)
+        task_payoff = payoff.expression if isinstance(payoff, CompiledPayoff) else payoff
+        if executor is not None and _picklable(task_payoff):
+            n_chunks = min(chunks or os.cpu_count() or 1, n_batches)
+        else:
+            n_chunks = 1
+        if n_chunks <= 1:
+            stats, sample_paths, sample_payoffs = _simulate_numpy(
+                payoff, main_seed, offset=0, paths=paths, **simulation
+            )
+        else:
+            bounds = [min(paths, batch_size * (n_batches * k // n_chunks)) for k in range(n_chunks + 1)]
+            futures = [
+                executor.submit(
+                    _simulate_numpy,
+                    task_payoff,
+                    main_seed,
+                    offset=start,
+                    paths=stop - start,
+                    **simulation,
+                )
+                for start, stop in zip(bounds, bounds[1:])
+            ]
+            stats = _PathStatistics()
+            sample_paths = sample_payoffs = None
+            for future in futures:
+                chunk_stats, chunk_paths, chunk_payoffs = future.result()
+                stats.merge(chunk_stats)
+                if sample_paths is None:
+                    sample_paths, sample_payoffs = chunk_paths, chunk_payoffs
 
-    return MonteCarloResult(price=price_estimate, payoffs=payoffs, paths=simulated_paths)
+    return MonteCarloResult(
+        price=discount_factor * stats.total / stats.paths,
+        stderr=discount_factor * stats.stderr(),
+        n_paths=stats.paths,
+        sample_paths=sample_paths,
+        sample_payoffs=sample_payoffs,
+    )
 
 
 if __name__ == "__main__":
@@ -179,6 +1061,41 @@ if __name__ == "__main__":
     parser.add_argument("--volatility", type=float, default=0.2, help="Asset volatility")
     parser.add_argument("--steps", type=int, default=50, help="Number of time steps per path")
     parser.add_argument("--paths", type=int, default=10000, help="Number of Monte Carlo paths")
+    parser.add_argument(
+        "--backend",
+        choices=("auto", "numpy", "numba", "cuda"),
+        default="auto",
+        help=(
+            "Simulation engine; 'numba' requires Numba and a standard payoff or one built from price, "
+            "the mean, max and min of path, arithmetic, max, min, exp, log and sqrt; 'cuda' requires "
+            "a CUDA GPU and a standard payoff"
+        ),
+    )
+    parser.add_argument(
+        "--no-antithetic",
+        dest="antithetic",
+        action="store_false",
+        help="Disable antithetic variates",
+    )
+    parser.add_argument(
+        "--control-variate",
+        choices=("underlying",),
+        default=None,
+        help="Use the terminal asset price as a control variate",
+    )
+    parser.add_argument(
+        "--method",
+        choices=("mc", "qmc"),
+        default="mc",
+        help="Pseudorandom ('mc') or Sobol' quasi-random ('qmc', requires SciPy) sampling",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=("float64", "float32"),
+        default="float64",
+        help="Precision of simulated paths with the NumPy backend",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
     parser.add_argument(
         "--payoff",
         required=True,
@@ -198,5 +1115,11 @@ if __name__ == "__main__":
         steps=args.steps,
         paths=args.paths,
         payoff=payoff_fn,
+        backend=args.backend,
+        seed=args.seed,
+        antithetic=args.antithetic,
+        control_variate=args.control_variate,
+        method=args.method,
+        dtype=args.dtype,
     )
-    print(f"Estimated option price: {result.price:.6f}")
+    print(f"Estimated option price: {result.price:.6f} (standard error {result.stderr:.6f})")
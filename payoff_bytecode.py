@@ -0,0 +1,267 @@
+"""Interpret payoff expressions as stack-machine bytecode with Numba.
+
+A payoff AST is lowered to postfix opcodes such as ``PUSH_PRICE PUSH_CONST SUB``
+over a fixed-size float stack, plus the array of constants that the
+``PUSH_CONST`` instructions consume in order. The interpreter only sees the
+terminal price and the mean, maximum and minimum of the path, so it runs inside
+the Numba simulation kernel in :mod:`mc_kernel`, which never stores whole paths,
+as well as over simulated path matrices. Programs are cached per expression.
+
+Only arithmetic, ``max``/``min`` of values, ``max(path)``, ``min(path)``,
+``sum(path) / len(path)`` and ``exp``/``log``/``sqrt`` are lowered. For anything
+else, or when Numba is not installed, :func:`compile_bytecode` returns ``None``
+and callers keep using the interpreted payoff. Division by zero and invalid
+arguments yield non-finite values rather than exceptions.
+"""
+from __future__ import annotations
+
+import ast
+import math
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    NUMBA_AVAILABLE = False
+else:
+    NUMBA_AVAILABLE = True
+
+PUSH_CONST = 0
+PUSH_PRICE = 1
+PUSH_PATH_MEAN = 2
+PUSH_PATH_MAX = 3
+PUSH_PATH_MIN = 4
+ADD = 5
+SUB = 6
+MUL = 7
+DIV = 8
+MAX = 9
+MIN = 10
+NEG = 11
+EXP = 12
+LOG = 13
+SQRT = 14
+
+STACK_SIZE = 32
+
+_PATH_OPS = {PUSH_PATH_MEAN, PUSH_PATH_MAX, PUSH_PATH_MIN}
+_CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau, "inf": math.inf}
+_BINARY_OPS = {ast.Add: ADD, ast.Sub: SUB, ast.Mult: MUL, ast.Div: DIV}
+_UNARY_FUNCTIONS = {"exp": EXP, "log": LOG, "sqrt": SQRT}
+# Net effect of each opcode on the stack depth.
+_STACK_EFFECT = {
+    **dict.fromkeys((PUSH_CONST, PUSH_PRICE, PUSH_PATH_MEAN, PUSH_PATH_MAX, PUSH_PATH_MIN), 1),
+    **dict.fromkeys((ADD, SUB, MUL, DIV, MAX, MIN), -1),
+    **dict.fromkeys((NEG, EXP, LOG, SQRT), 0),
+}
+
+
+class _Unsupported(Exception):
+    """Raised when an expression falls outside the bytecode subset."""
+
+
+def _is_path(node: ast.AST) -> bool:
+    return isinstance(node, ast.Name) and node.id == "path"
+
+
+def _is_path_call(node: ast.AST, name: str) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == name
+        and len(node.args) == 1
+        and not node.keywords
+        and _is_path(node.args[0])
+    )
+
+
+class _Assembler:
+    """Lower a payoff AST to postfix opcodes and their constants."""
+
+    def __init__(self) -> None:
+        self.ops: List[int] = []
+        self.consts: List[float] = []
+
+    def lower(self, node: ast.AST) -> None:
+        method = getattr(self, f"_lower_{type(node).__name__}", None)
+        if method is None:
+            raise _Unsupported(type(node).__name__)
+        method(node)
+
+    def _push_const(self, value: float) -> None:
+        self.ops.append(PUSH_CONST)
+        self.consts.append(float(value))
+
+    def _lower_Expression(self, node: ast.Expression) -> None:
+        self.lower(node.body)
+
+    def _lower_Constant(self, node: ast.Constant) -> None:
+        if type(node.value) not in (bool, int, float):
+            raise _Unsupported(repr(node.value))
+        self._push_const(node.value)
+
+    def _lower_Name(self, node: ast.Name) -> None:
+        if node.id == "price":
+            self.ops.append(PUSH_PRICE)
+        elif node.id in _CONSTANTS:
+            self._push_const(_CONSTANTS[node.id])
+        else:
+            raise _Unsupported(node.id)
+
+    def _lower_Attribute(self, node: ast.Attribute) -> None:
+        if not (isinstance(node.value, ast.Name) and node.value.id == "math" and node.attr in _CONSTANTS):
+            raise _Unsupported(node.attr)
+        self._push_const(_CONSTANTS[node.attr])
+
+    def _lower_UnaryOp(self, node: ast.UnaryOp) -> None:
+        if not isinstance(node.op, (ast.USub, ast.UAdd)):
+            raise _Unsupported(type(node.op).__name__)
+        self.lower(node.operand)
+        if isinstance(node.op, ast.USub):
+            self.ops.append(NEG)
+
+    def _lower_BinOp(self, node: ast.BinOp) -> None:
+        if isinstance(node.op, ast.Div) and _is_path_call(node.left, "sum") and _is_path_call(node.right, "len"):
+            self.ops.append(PUSH_PATH_MEAN)
+            return
+        op = _BINARY_OPS.get(type(node.op))
+        if op is None:
+            raise _Unsupported(type(node.op).__name__)
+        self.lower(node.left)
+        self.lower(node.right)
+        self.ops.append(op)
+
+    def _lower_Call(self, node: ast.Call) -> None:
+        if node.keywords:
+            raise _Unsupported("keyword arguments")
+        name = node.func.attr if isinstance(node.func, ast.Attribute) else node.func.id
+        args = node.args
+
+        if name in ("max", "min"):
+            if len(args) == 1 and _is_path(args[0]):
+                self.ops.append(PUSH_PATH_MAX if name == "max" else PUSH_PATH_MIN)
+                return
+            if len(args) < 2:
+                raise _Unsupported(f"{name}() of a single value")
+            self.lower(args[0])
+            for arg in args[1:]:
+                self.lower(arg)
+                self.ops.append(MAX if name == "max" else MIN)
+            return
+        if name in _UNARY_FUNCTIONS and len(args) == 1:
+            self.lower(args[0])
+            self.ops.append(_UNARY_FUNCTIONS[name])
+            return
+        raise _Unsupported(name)
+
+
+def _stack_depth(ops: List[int]) -> int:
+    depth = deepest = 0
+    for op in ops:
+        depth += _STACK_EFFECT[op]
+        deepest = max(deepest, depth)
+    return deepest
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, error_model="numpy", inline="always")
+    def evaluate(ops, consts, price, mean, high, low):
+        """Run ``ops`` for one path described by its terminal price and statistics."""
+        stack = np.empty(STACK_SIZE)
+        top = -1
+        const = 0
+        for op in ops:
+            if op == PUSH_CONST:
+                top += 1
+                stack[top] = consts[const]
+                const += 1
+            elif op == PUSH_PRICE:
+                top += 1
+                stack[top] = price
+            elif op == PUSH_PATH_MEAN:
+                top += 1
+                stack[top] = mean
+            elif op == PUSH_PATH_MAX:
+                top += 1
+                stack[top] = high
+            elif op == PUSH_PATH_MIN:
+                top += 1
+                stack[top] = low
+            elif op == NEG:
+                stack[top] = -stack[top]
+            elif op == EXP:
+                stack[top] = math.exp(stack[top])
+            elif op == LOG:
+                stack[top] = math.log(stack[top])
+            elif op == SQRT:
+                stack[top] = math.sqrt(stack[top])
+            else:
+                right = stack[top]
+                top -= 1
+                left = stack[top]
+                if op == ADD:
+                    stack[top] = left + right
+                elif op == SUB:
+                    stack[top] = left - right
+                elif op == MUL:
+                    stack[top] = left * right
+                elif op == DIV:
+                    stack[top] = left / right
+                elif op == MAX:
+                    stack[top] = right if right > left else left
+                else:
+                    stack[top] = right if right < left else left
+        return stack[top]
+
+    @njit(cache=True, error_model="numpy")
+    def _evaluate_paths(ops, consts, reads_path, prices, paths, out):
+        for i in range(prices.shape[0]):
+            mean = high = low = 0.0
+            if reads_path:
+                total = high = low = float(paths[i, 0])
+                for t in range(1, paths.shape[1]):
+                    value = float(paths[i, t])
+                    total += value
+                    high = max(high, value)
+                    low = min(low, value)
+                mean = total / paths.shape[1]
+            out[i] = evaluate(ops, consts, float(prices[i]), mean, high, low)
+
+
+class BytecodePayoff:
+    """A payoff expression lowered to stack-machine bytecode."""
+
+    def __init__(self, ops: List[int], consts: List[float]) -> None:
+        self.ops = np.array(ops, dtype=np.int32)
+        self.consts = np.array(consts, dtype=np.float64)
+        self.reads_path = any(op in _PATH_OPS for op in ops)
+
+    def __call__(self, price: float, path) -> float:
+        return float(self.vector(np.array([price]), np.asarray(path, dtype=np.float64)[np.newaxis])[0])
+
+    def vector(self, prices: np.ndarray, paths: np.ndarray) -> np.ndarray:
+        """Evaluate every row of a ``(paths, steps + 1)`` matrix at once."""
+
+        out = np.empty(len(prices))
+        _evaluate_paths(self.ops, self.consts, self.reads_path, prices, paths, out)
+        return out
+
+
+@lru_cache(maxsize=256)
+def compile_bytecode(expression: str) -> Optional[BytecodePayoff]:
+    """Lower ``expression`` to bytecode, or return ``None`` if it cannot be."""
+
+    if not NUMBA_AVAILABLE:
+        return None
+    assembler = _Assembler()
+    try:
+        assembler.lower(ast.parse(expression, mode="eval"))
+    except (SyntaxError, _Unsupported):
+        return None
+    if _stack_depth(assembler.ops) > STACK_SIZE:
+        return None
+    return BytecodePayoff(assembler.ops, assembler.consts)
@@ -0,0 +1,454 @@
+"""Compile payoff expressions to machine code with llvmlite.
+
+A payoff AST is lowered to a list of three-address instructions such as
+``("mul", 2, 0, 1)``, meaning ``t2 = t0 * t1``, which are emitted as the LLVM
+function ``double payoff(double price, double* path, i32 n)``. A second function,
+``payoff_paths``, loops over a C-contiguous path matrix and is marked for the loop
+vectorizer. Compiled payoffs are cached per expression string.
+
+Only a numeric subset of the payoff language is lowered: arithmetic, comparisons,
+conditionals, ``max``/``min``/``sum``/``len`` reductions over ``path``, constant
+indices into ``path`` and the common :mod:`math` functions. For anything else, or
+when llvmlite is not installed, :func:`compile_native` returns ``None`` and
+callers keep using the interpreted payoff. Division by zero, overflow and
+out-of-range indices yield non-finite values rather than exceptions.
+"""
+from __future__ import annotations
+
+import ast
+import ctypes
+import math
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import llvmlite.binding as llvm
+    from llvmlite import ir
+except ImportError:  # pragma: no cover - optional dependency
+    LLVM_AVAILABLE = False
+else:
+    LLVM_AVAILABLE = hasattr(llvm, "create_pipeline_tuning_options")
+
+if LLVM_AVAILABLE:
+    try:
+        llvm.initialize()
+    except RuntimeError:  # newer llvmlite initializes LLVM on its own
+        pass
+    llvm.initialize_native_target()
+    llvm.initialize_native_asmprinter()
+
+Instruction = Tuple
+
+_CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau, "inf": math.inf}
+_UNARY_INTRINSICS = {
+    "ceil": "llvm.ceil",
+    "cos": "llvm.cos",
+    "exp": "llvm.exp",
+    "fabs": "llvm.fabs",
+    "floor": "llvm.floor",
+    "log": "llvm.log",
+    "log10": "llvm.log10",
+    "log2": "llvm.log2",
+    "sin": "llvm.sin",
+    "sqrt": "llvm.sqrt",
+    "trunc": "llvm.trunc",
+}
+_BINARY_INTRINSICS = {"copysign": "llvm.copysign", "pow": "llvm.pow"}
+_PATH_REDUCTIONS = {"max": "path_max", "min": "path_min", "sum": "path_sum", "fsum": "path_sum", "len": "path_len"}
+_PATH_LOOP_OPS = {"path_max", "path_min", "path_sum"}
+_BINARY_OPS = {
+    ast.Add: "add",
+    ast.Sub: "sub",
+    ast.Mult: "mul",
+    ast.Div: "div",
+    ast.Pow: "pow",
+    ast.FloorDiv: "floordiv",
+    ast.Mod: "mod",
+}
+_COMPARISONS = {ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "==", ast.NotEq: "!="}
+
+
+class _Unsupported(Exception):
+    """Raised when an expression falls outside the compiled subset."""
+
+
+class _Lowering:
+    """Lower a payoff AST to three-address instructions ``(op, dest, *operands)``."""
+
+    def __init__(self) -> None:
+        self.instructions: List[Instruction] = []
+
+    def emit(self, op: str, *operands) -> int:
+        dest = len(self.instructions)
+        self.instructions.append((op, dest, *operands))
+        return dest
+
+    def lower(self, node: ast.AST) -> int:
+        method = getattr(self, f"_lower_{type(node).__name__}", None)
+        if method is None:
+            raise _Unsupported(type(node).__name__)
+        return method(node)
+
+    def _lower_Expression(self, node: ast.Expression) -> int:
+        return self.lower(node.body)
+
+    def _lower_Constant(self, node: ast.Constant) -> int:
+        if type(node.value) not in (bool, int, float):
+            raise _Unsupported(repr(node.value))
+        return self.emit("const", float(node.value))
+
+    def _lower_Name(self, node: ast.Name) -> int:
+        if node.id == "price":
+            return self.emit("price")
+        if node.id in _CONSTANTS:
+            return self.emit("const", _CONSTANTS[node.id])
+        raise _Unsupported(node.id)
+
+    def _lower_Attribute(self, node: ast.Attribute) -> int:
+        if isinstance(node.value, ast.Name) and node.value.id == "math" and node.attr in _CONSTANTS:
+            return self.emit("const", _CONSTANTS[node.attr])
+        raise _Unsupported(node.attr)
+
+    def _lower_UnaryOp(self, node: ast.UnaryOp) -> int:
+        operand = self.lower(node.operand)
+        if isinstance(node.op, ast.USub):
+            return self.emit("neg", operand)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        raise _Unsupported(type(node.op).__name__)
+
+    def _lower_BinOp(self, node: ast.BinOp) -> int:
+        op = _BINARY_OPS.get(type(node.op))
+        if op is None:
+            raise _Unsupported(type(node.op).__name__)
+        return self.emit(op, self.lower(node.left), self.lower(node.right))
+
+    def _lower_Compare(self, node: ast.Compare) -> int:
+        left = self.lower(node.left)
+        result = None
+        for op, comparator in zip(node.ops, node.comparators):
+            right = self.lower(comparator)
+            test = self.emit("cmp", _COMPARISONS[type(op)], left, right)
+            # Comparisons yield 0.0 or 1.0, so a chain is the product of its tests.
+            result = test if result is None else self.emit("mul", result, test)
+            left = right
+        return result
+
+    def _lower_BoolOp(self, node: ast.BoolOp) -> int:
+        values = [self.lower(value) for value in node.values]
+        result = values[-1]
+        for value in reversed(values[:-1]):
+            if isinstance(node.op, ast.And):
+                result = self.emit("select", value, result, value)
+            else:
+                result = self.emit("select", value, value, result)
+        return result
+
+    def _lower_IfExp(self, node: ast.IfExp) -> int:
+        return self.emit("select", self.lower(node.test), self.lower(node.body), self.lower(node.orelse))
+
+    def _lower_Subscript(self, node: ast.Subscript) -> int:
+        if not (isinstance(node.value, ast.Name) and node.value.id == "path"):
+            raise _Unsupported("subscript")
+        index = node.slice.value if isinstance(node.slice, ast.Index) else node.slice
+        sign = 1
+        if isinstance(index, ast.UnaryOp) and isinstance(index.op, ast.USub):
+            sign, index = -1, index.operand
+        if not (isinstance(index, ast.Constant) and type(index.value) is int):
+            raise _Unsupported("non-constant index")
+        return self.emit("path_index", sign * index.value)
+
+    def _lower_Call(self, node: ast.Call) -> int:
+        if node.keywords:
+            raise _Unsupported("keyword arguments")
+        name = node.func.attr if isinstance(node.func, ast.Attribute) else node.func.id
+        args = node.args
+
+        if name in _PATH_REDUCTIONS and len(args) == 1 and isinstance(args[0], ast.Name) and args[0].id == "path":
+            return self.emit(_PATH_REDUCTIONS[name])
+        if name in ("max", "min", "sum"):
+            if len(args) == 1 and isinstance(args[0], (ast.List, ast.Tuple)):
+                args = args[0].elts
+            elif len(args) == 1 or name == "sum":
+                raise _Unsupported(f"{name}() of a non-path argument")
+            if not args:
+                raise _Unsupported(f"{name}() without arguments")
+            op = "add" if name == "sum" else name
+            result = self.lower(args[0])
+            for arg in args[1:]:
+                result = self.emit(op, result, self.lower(arg))
+            return result
+        if name == "log" and len(args) == 2:
+            numerator = self.emit("call", "llvm.log", self.lower(args[0]))
+            return self.emit("div", numerator, self.emit("call", "llvm.log", self.lower(args[1])))
+        if name in _UNARY_INTRINSICS and len(args) == 1:
+            return self.emit("call", _UNARY_INTRINSICS[name], self.lower(args[0]))
+        if name in _BINARY_INTRINSICS and len(args) == 2:
+            return self.emit("call2", _BINARY_INTRINSICS[name], self.lower(args[0]), self.lower(args[1]))
+        raise _Unsupported(name)
+
+
+def _emit_path_loop(builder, function, path, n) -> Dict[str, "ir.Value"]:
+    """Emit one pass over ``path`` computing its max, min and sum."""
+
+    double = ir.DoubleType()
+    i32 = ir.IntType(32)
+    entry = builder.block
+    loop = function.append_basic_block("path_loop")
+    done = function.append_basic_block("path_done")
+
+    first = builder.load(path)
+    builder.cbranch(builder.icmp_signed(">", n, i32(1)), loop, done)
+
+    builder.position_at_end(loop)
+    index = builder.phi(i32)
+    high = builder.phi(double)
+    low = builder.phi(double)
+    total = builder.phi(double)
+    value = builder.load(builder.gep(path, [index]))
+    next_high = builder.select(builder.fcmp_ordered(">", value, high), value, high)
+    next_low = builder.select(builder.fcmp_ordered("<", value, low), value, low)
+    next_total = builder.fadd(total, value)
+    next_index = builder.add(index, i32(1))
+    for phi, start, step in ((index, i32(1), next_index), (high, first, next_high), (low, first, next_low), (total, first, next_total)):
+        phi.add_incoming(start, entry)
+        phi.add_incoming(step, loop)
+    builder.cbranch(builder.icmp_signed("<", next_index, n), loop, done)
+
+    builder.position_at_end(done)
+    results = {}
+    for name, start, step in (("path_max", first, next_high), ("path_min", first, next_low), ("path_sum", first, next_total)):
+        phi = builder.phi(double)
+        phi.add_incoming(start, entry)
+        phi.add_incoming(step, loop)
+        results[name] = phi
+    return results
+
+
+def _binary_intrinsic(module, name: str) -> "ir.Function":
+    # llvmlite only infers the two-operand signature for a few intrinsics such as pow.
+    double = ir.DoubleType()
+    return module.declare_intrinsic(name, [double], ir.FunctionType(double, [double, double]))
+
+
+def _emit_divmod(module, builder, left, right) -> Tuple["ir.Value", "ir.Value"]:
+    """Emit ``left // right`` and ``left % right`` the way CPython's ``float_divmod`` does.
+
+    Both come from ``fmod``, so they match Python even when ``right`` is not exact
+    in binary, e.g. ``100 // 0.1 == 999``. Branches become selects to keep the
+    path loop vectorizable; a zero divisor yields NaN.
+    """
+
+    double = ir.DoubleType()
+    copysign = _binary_intrinsic(module, "llvm.copysign")
+    floor = module.declare_intrinsic("llvm.floor", [double])
+
+    remainder = builder.frem(left, right)
+    quotient = builder.fdiv(builder.fsub(left, remainder), right)
+    # Move a nonzero remainder to the sign of the divisor.
+    adjust = builder.and_(
+        builder.fcmp_ordered("!=", remainder, double(0.0)),
+        builder.xor(builder.fcmp_ordered("<", right, double(0.0)), builder.fcmp_ordered("<", remainder, double(0.0))),
+    )
+    quotient = builder.select(adjust, builder.fsub(quotient, double(1.0)), quotient)
+    remainder = builder.select(
+        builder.fcmp_ordered("==", remainder, double(0.0)),
+        builder.call(copysign, [double(0.0), right]),
+        builder.select(adjust, builder.fadd(remainder, right), remainder),
+    )
+    # Round the quotient to the nearest integer, keeping the sign of a zero.
+    floored = builder.call(floor, [quotient])
+    rounded = builder.select(
+        builder.fcmp_ordered(">", builder.fsub(quotient, floored), double(0.5)),
+        builder.fadd(floored, double(1.0)),
+        floored,
+    )
+    quotient = builder.select(
+        builder.fcmp_unordered("!=", quotient, double(0.0)),
+        rounded,
+        builder.call(copysign, [double(0.0), builder.fdiv(left, right)]),
+    )
+    return quotient, remainder
+
+
+def _emit_payoff(module, instructions: List[Instruction]) -> "ir.Function":
+    double = ir.DoubleType()
+    i32 = ir.IntType(32)
+    function = ir.Function(module, ir.FunctionType(double, [double, double.as_pointer(), i32]), name="payoff")
+    function.attributes.add("alwaysinline")
+    function.attributes.add("nounwind")
+    price, path, n = function.args
+    builder = ir.IRBuilder(function.append_basic_block("entry"))
+
+    used = {instruction[0] for instruction in instructions}
+    stats = _emit_path_loop(builder, function, path, n) if used & _PATH_LOOP_OPS else {}
+
+    values: List = []
+    for op, _dest, *operands in instructions:
+        args = [values[operand] for operand in operands if isinstance(operand, int) and op not in ("const", "path_index")]
+        if op == "const":
+            value = double(operands[0])
+        elif op == "price":
+            value = price
+        elif op in stats:
+            value = stats[op]
+        elif op == "path_len":
+            value = builder.sitofp(n, double)
+        elif op == "path_index":
+            position = operands[0]
+            index = i32(position) if position >= 0 else builder.add(n, i32(position))
+            in_range = builder.and_(builder.icmp_signed(">=", index, i32(0)), builder.icmp_signed("<", index, n))
+            loaded = builder.load(builder.gep(path, [builder.select(in_range, index, i32(0))]))
+            value = builder.select(in_range, loaded, double(math.nan))
+        elif op == "add":
+            value = builder.fadd(*args)
+        elif op == "sub":
+            value = builder.fsub(*args)
+        elif op == "mul":
+            value = builder.fmul(*args)
+        elif op == "div":
+            value = builder.fdiv(*args)
+        elif op == "neg":
+            value = builder.fsub(double(-0.0), args[0])
+        elif op == "pow":
+            value = builder.call(module.declare_intrinsic("llvm.pow", [double]), args)
+        elif op in ("floordiv", "mod"):
+            quotient, remainder = _emit_divmod(module, builder, *args)
+            value = quotient if op == "floordiv" else remainder
+        elif op == "max":
+            value = builder.select(builder.fcmp_ordered(">", args[1], args[0]), args[1], args[0])
+        elif op == "min":
+            value = builder.select(builder.fcmp_ordered("<", args[1], args[0]), args[1], args[0])
+        elif op == "cmp":
+            symbol = operands[0]
+            left, right = values[operands[1]], values[operands[2]]
+            # NaN compares unequal to everything, as in Python.
+            test = builder.fcmp_unordered(symbol, left, right) if symbol == "!=" else builder.fcmp_ordered(symbol, left, right)
+            value = builder.uitofp(test, double)
+        elif op == "select":
+            test = builder.fcmp_unordered("!=", args[0], double(0.0))
+            value = builder.select(test, args[1], args[2])
+        elif op == "call":
+            value = builder.call(module.declare_intrinsic(operands[0], [double]), [values[operands[1]]])
+        elif op == "call2":
+            value = builder.call(_binary_intrinsic(module, operands[0]), [values[operands[1]], values[operands[2]]])
+        else:  # pragma: no cover - lowering only produces the ops above
+            raise _Unsupported(op)
+        values.append(value)
+
+    builder.ret(values[-1])
+    return function
+
+
+def _emit_payoff_paths(module, payoff, vectorize: bool) -> None:
+    """Emit ``void payoff_paths(double* prices, double* paths, i64 n_paths, i64 n_cols, double* out)``.
+
+    ``vectorize`` requests loop vectorization, which only succeeds when the payoff
+    has no loop of its own over the path.
+    """
+
+    double = ir.DoubleType()
+    i32 = ir.IntType(32)
+    i64 = ir.IntType(64)
+    pointer = double.as_pointer()
+    function = ir.Function(
+        module, ir.FunctionType(ir.VoidType(), [pointer, pointer, i64, i64, pointer]), name="payoff_paths"
+    )
+    prices, paths, n_paths, n_cols, out = function.args
+    for argument in (prices, paths, out):
+        argument.add_attribute("noalias")
+
+    entry = function.append_basic_block("entry")
+    loop = function.append_basic_block("loop")
+    done = function.append_basic_block("done")
+    builder = ir.IRBuilder(entry)
+    builder.cbranch(builder.icmp_signed(">", n_paths, i64(0)), loop, done)
+
+    builder.position_at_end(loop)
+    index = builder.phi(i64)
+    price = builder.load(builder.gep(prices, [index]))
+    row = builder.gep(paths, [builder.mul(index, n_cols)])
+    value = builder.call(payoff, [price, row, builder.trunc(n_cols, i32)])
+    builder.store(value, builder.gep(out, [index]))
+    next_index = builder.add(index, i64(1))
+    index.add_incoming(i64(0), entry)
+    index.add_incoming(next_index, loop)
+    branch = builder.cbranch(builder.icmp_signed("<", next_index, n_paths), loop, done)
+
+    if vectorize:
+        # Loop IDs must refer to themselves, which add_metadata cannot express directly.
+        enable = module.add_metadata([ir.MetaDataString(module, "llvm.loop.vectorize.enable"), ir.IntType(1)(1)])
+        loop_id = module.add_metadata([enable])
+        loop_id.operands = (loop_id, enable)
+        branch.set_metadata("llvm.loop", loop_id)
+
+    builder.position_at_end(done)
+    builder.ret_void()
+
+
+_DOUBLE_P = ctypes.POINTER(ctypes.c_double)
+_SCALAR_SIGNATURE = ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_double, _DOUBLE_P, ctypes.c_int)
+_VECTOR_SIGNATURE = ctypes.CFUNCTYPE(None, _DOUBLE_P, _DOUBLE_P, ctypes.c_int64, ctypes.c_int64, _DOUBLE_P)
+
+
+class NativePayoff:
+    """A payoff expression compiled to machine code."""
+
+    def __init__(self, instructions: List[Instruction]) -> None:
+        module = ir.Module(name="payoff")
+        walks_path = any(instruction[0] in _PATH_LOOP_OPS for instruction in instructions)
+        _emit_payoff_paths(module, _emit_payoff(module, instructions), vectorize=not walks_path)
+
+        target_machine = llvm.Target.from_default_triple().create_target_machine(
+            cpu=llvm.get_host_cpu_name(), features=llvm.get_host_cpu_features().flatten(), opt=3
+        )
+        compiled = llvm.parse_assembly(str(module))
+        compiled.triple = target_machine.triple
+        compiled.data_layout = str(target_machine.target_data)
+        compiled.verify()
+        tuning = llvm.create_pipeline_tuning_options(speed_level=3)
+        tuning.loop_vectorization = True
+        tuning.slp_vectorization = True
+        pass_builder = llvm.create_pass_builder(target_machine, tuning)
+        pass_builder.getModulePassManager().run(compiled, pass_builder)
+
+        self.instructions = instructions
+        self._engine = llvm.create_mcjit_compiler(compiled, target_machine)
+        self._engine.finalize_object()
+        self._scalar = _SCALAR_SIGNATURE(self._engine.get_function_address("payoff"))
+        self._vector = _VECTOR_SIGNATURE(self._engine.get_function_address("payoff_paths"))
+
+    def __call__(self, price: float, path) -> float:
+        values = np.ascontiguousarray(path, dtype=np.float64)
+        return self._scalar(float(price), values.ctypes.data_as(_DOUBLE_P), len(values))
+
+    def vector(self, prices: np.ndarray, paths: np.ndarray) -> np.ndarray:
+        """Evaluate every row of a ``(paths, steps + 1)`` matrix at once."""
+
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        paths = np.ascontiguousarray(paths, dtype=np.float64)
+        out = np.empty(len(prices))
+        self._vector(
+            prices.ctypes.data_as(_DOUBLE_P),
+            paths.ctypes.data_as(_DOUBLE_P),
+            len(prices),
+            paths.shape[1],
+            out.ctypes.data_as(_DOUBLE_P),
+        )
+        return out
+
+
+@lru_cache(maxsize=256)
+def compile_native(expression: str) -> Optional[NativePayoff]:
+    """Compile ``expression`` to native code, or return ``None`` if it cannot be."""
+
+    if not LLVM_AVAILABLE:
+        return None
+    lowering = _Lowering()
+    try:
+        lowering.lower(ast.parse(expression, mode="eval"))
+    except (SyntaxError, _Unsupported):
+        return None
+    return NativePayoff(lowering.instructions)
@@ -0,0 +1,21 @@
+"""Build the optional compiled binomial kernel.
+
+    python setup.py build_ext --inplace
+"""
+import numpy as np
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+extensions = [
+    Extension(
+        "binomial_c",
+        ["binomial_c.pyx"],
+        include_dirs=[np.get_include()],
+        extra_compile_args=["-O3", "-ffast-math", "-march=native"],
+    )
+]
+
+setup(
+    name="binomial_c",
+    ext_modules=cythonize(extensions, compiler_directives={"language_level": 3}),
+)
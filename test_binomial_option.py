@@ -0,0 +1,102 @@
+import itertools
+from math import exp, sqrt
+
+import numpy as np
+import pytest
+
+import binomial_option
+from binomial_option import binomial_option_price
+
+STEPS = [1, 2, 7, 50]
+CASES = list(
+    itertools.product(
+        [(100.0, 100.0), (100.0, 90.0), (95.0, 110.0)],  # spot, strike
+        ["call", "put"],
+        [False, True],  # american
+        [0.0, 0.03],  # dividend
+        STEPS,
+    )
+)
+
+
+def _reference(spot, strike, maturity, rate, volatility, steps, option_type, american, dividend):
+    """The original list-of-lists CRR tree, returning its price and both lattices."""
+
+    dt = maturity / steps
+    up = exp(volatility * sqrt(dt))
+    down = 1 / up
+    probability = (exp((rate - dividend) * dt) - down) / (up - down)
+    discount = exp(-rate * dt)
+
+    def intrinsic(price):
+        return max(price - strike, 0) if option_type == "call" else max(strike - price, 0)
+
+    asset_prices = [[spot * up**j * down ** (step - j) for j in range(step + 1)] for step in range(steps + 1)]
+    option_values = [[] for _ in range(steps + 1)]
+    option_values[-1] = [intrinsic(price) for price in asset_prices[-1]]
+    for step in range(steps - 1, -1, -1):
+        option_values[step] = []
+        for node in range(step + 1):
+            value = discount * (
+                probability * option_values[step + 1][node + 1] + (1 - probability) * option_values[step + 1][node]
+            )
+            if american:
+                value = max(value, intrinsic(asset_prices[step][node]))
+            option_values[step].append(value)
+    return option_values[0][0], asset_prices, option_values
+
+
+def _import_kernel(module, name):
+    try:
+        return getattr(__import__(module), name)
+    except ImportError:
+        pytest.skip(f"{module} is not built")
+
+
+@pytest.fixture(params=["cython", "numba", "numpy"])
+def backend(request, monkeypatch):
+    """Force :func:`binomial_option_price` onto one of its CRR implementations."""
+
+    if request.param == "cython":
+        kernel = _import_kernel("binomial_c", "crr_price")
+    elif request.param == "numba":
+        kernel = _import_kernel("fast_kernels", "crr_vanilla")
+    else:
+        kernel = None
+    monkeypatch.setattr(binomial_option, "_crr_price", kernel)
+    return request.param
+
+
+@pytest.mark.parametrize("prices, option_type, american, dividend, steps", CASES)
+def test_price_matches_reference(backend, prices, option_type, american, dividend, steps):
+    spot, strike = prices
+    args = (spot, strike, 1.0, 0.05, 0.2, steps, option_type, american, dividend)
+    expected, _, _ = _reference(*args)
+
+    result = binomial_option_price(*args)
+    assert result.price == pytest.approx(expected, rel=1e-13, abs=1e-13)
+    assert result.asset_prices.size == result.option_values.size == 0
+
+
+@pytest.mark.parametrize("prices, option_type, american, dividend, steps", CASES)
+def test_lattice_matches_reference(prices, option_type, american, dividend, steps):
+    spot, strike = prices
+    args = (spot, strike, 1.0, 0.05, 0.2, steps, option_type, american, dividend)
+    expected, asset_rows, value_rows = _reference(*args)
+
+    result = binomial_option_price(*args, return_lattice=True)
+    assert result.price == pytest.approx(expected, rel=1e-13, abs=1e-13)
+    assert result.asset_prices.shape == result.option_values.shape == (steps + 1, steps + 1)
+    for step in range(steps + 1):
+        np.testing.assert_allclose(result.asset_prices[step, : step + 1], asset_rows[step], rtol=1e-13)
+        # Node prices differ from the reference by a few ulps, which turns into an
+        # absolute error of about 1e-13 in the intrinsic value of at-the-money nodes.
+        np.testing.assert_allclose(result.option_values[step, : step + 1], value_rows[step], rtol=1e-13, atol=1e-12)
+        assert np.isnan(result.asset_prices[step, step + 1 :]).all()
+        assert np.isnan(result.option_values[step, step + 1 :]).all()
+
+
+def test_american_put_is_worth_at_least_the_european_put(backend):
+    european = binomial_option_price(100.0, 110.0, 1.0, 0.05, 0.2, 200, "put")
+    american = binomial_option_price(100.0, 110.0, 1.0, 0.05, 0.2, 200, "put", american=True)
+    assert american.price > european.price >= 0.0
@@ -0,0 +1,66 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import mc_kernel
+from monte_carlo_option import _batch_size, monte_carlo_option_price, payoff_from_expression
+
+STEPS = 255
+# Three batches, the last one partial.
+PATHS = 2 * _batch_size(STEPS) + 1808
+OPTIONS = dict(spot=100.0, maturity=1.0, rate=0.05, volatility=0.2, steps=STEPS, paths=PATHS, backend="numpy", seed=7)
+EXPRESSION = "max(sum(path) / len(path) - price, 0) + max(price - 105, 0)"
+
+
+def _assert_same_result(result, expected):
+    assert result.n_paths == expected.n_paths
+    assert result.price == pytest.approx(expected.price, rel=1e-12)
+    assert result.stderr == pytest.approx(expected.stderr, rel=1e-9)
+    np.testing.assert_array_equal(result.sample_paths, expected.sample_paths)
+    np.testing.assert_array_equal(result.sample_payoffs, expected.sample_payoffs)
+
+
+@pytest.mark.parametrize("method", ["mc", "qmc"])
+@pytest.mark.parametrize("antithetic", [False, True])
+@pytest.mark.parametrize("control_variate", [None, "underlying"])
+def test_result_does_not_depend_on_chunk_count(method, antithetic, control_variate):
+    options = dict(OPTIONS, method=method, antithetic=antithetic, control_variate=control_variate)
+    payoff = payoff_from_expression(EXPRESSION)
+    serial = monte_carlo_option_price(payoff=payoff, **options)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        for chunks in (1, 2, 3, 8):
+            result = monte_carlo_option_price(payoff=payoff, executor=executor, chunks=chunks, **options)
+            _assert_same_result(result, serial)
+
+
+def test_process_pool_matches_serial_run():
+    payoff = payoff_from_expression(EXPRESSION)
+    serial = monte_carlo_option_price(payoff=payoff, **OPTIONS)
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        result = monte_carlo_option_price(payoff=payoff, executor=executor, chunks=3, **OPTIONS)
+        # A lambda cannot be pickled, so it runs serially instead of failing.
+        scalar = monte_carlo_option_price(
+            payoff=lambda price, path: payoff(price, path), executor=executor, chunks=3, **OPTIONS
+        )
+
+    _assert_same_result(result, serial)
+    assert scalar.price == pytest.approx(serial.price, rel=1e-12)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "numba"])
+@pytest.mark.parametrize("antithetic", [False, True])
+@pytest.mark.parametrize("expression", ["max(price - 100, 0)", "max(100 - price, 0)"])
+def test_control_variate_reduces_stderr(backend, antithetic, expression):
+    if backend == "numba" and not mc_kernel.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    options = dict(OPTIONS, steps=8, paths=50000, backend=backend, antithetic=antithetic)
+    payoff = payoff_from_expression(expression)
+    plain = monte_carlo_option_price(payoff=payoff, **options)
+    controlled = monte_carlo_option_price(payoff=payoff, control_variate="underlying", **options)
+
+    assert controlled.stderr < plain.stderr
+    assert controlled.price == pytest.approx(plain.price, abs=4 * plain.stderr)
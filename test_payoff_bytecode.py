@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+import mc_kernel
+import payoff_bytecode
+from monte_carlo_option import monte_carlo_option_price, payoff_from_expression
+
+pytestmark = pytest.mark.skipif(not payoff_bytecode.NUMBA_AVAILABLE, reason="numba is not installed")
+
+PATHS = np.array(
+    [
+        [100.0, 95.0, 90.0, 85.0],
+        [100.0, 104.0, 98.0, 100.0],
+        [100.0, 110.0, 120.0, 130.0],
+        [100.0, 80.0, 120.0, 93.5],
+    ]
+)
+PRICES = PATHS[:, -1].copy()
+
+EXPRESSIONS = [
+    "max(sum(path) / len(path) - price, 0)",
+    "max(path) - min(path) + -price",
+    "max(price - 90, 0, price / 2) - min(price, max(path), 100)",
+    "exp(-price / 100) * sqrt(price) + log(price) / pi - e",
+    "+price * 2 - 3 / (price - 50)",
+]
+KERNEL_ARGS = dict(spot=100.0, drift=0.0002, diffusion=0.02, steps=16, paths=10000, strike=100.0, sample_size=5)
+
+
+@pytest.fixture(params=["jit", "aot"])
+def kernel(request, monkeypatch):
+    """Force :func:`mc_kernel.run` onto the JIT or the prebuilt kernel."""
+
+    if request.param == "jit":
+        if not mc_kernel._JIT_AVAILABLE:
+            pytest.skip("numba is not installed")
+        monkeypatch.setattr(mc_kernel, "_prebuilt_run", None)
+    else:
+        if mc_kernel._prebuilt_run is None:
+            pytest.skip("fast_kernels is not built")
+        monkeypatch.setattr(mc_kernel, "runs_in_parallel", lambda: False)
+    return request.param
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_bytecode_matches_scalar(expression):
+    payoff = payoff_from_expression(expression)
+    bytecode = payoff_bytecode.compile_bytecode(expression)
+    expected = [payoff(float(price), path.tolist()) for price, path in zip(PRICES, PATHS)]
+
+    np.testing.assert_allclose(bytecode.vector(PRICES, PATHS), expected, rtol=1e-12)
+    assert bytecode(PRICES[2], PATHS[2]) == pytest.approx(expected[2], rel=1e-12)
+
+
+@pytest.mark.parametrize(
+    "expression", ["price % 2", "path[0]", "price > 100", "sum(path)", "max(price)", "abs(price)", "'price'"]
+)
+def test_unsupported_expressions_are_not_lowered(expression):
+    assert payoff_bytecode.compile_bytecode(expression) is None
+
+
+def test_deep_expressions_are_not_lowered():
+    depth = payoff_bytecode.STACK_SIZE + 1
+    # "(price*0+(price*1+...))" keeps every partial sum on the stack.
+    expression = "+".join(f"(price*{i}" for i in range(depth)) + ")" * depth
+    assert payoff_bytecode.compile_bytecode(expression) is None
+
+
+def test_invalid_arithmetic_yields_non_finite_values():
+    values = payoff_bytecode.compile_bytecode("1 / (price - 100) + log(price - 130)").vector(PRICES, PATHS)
+    assert not np.isfinite(values).any()
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_kernel_sample_payoffs_match_scalar(kernel, expression):
+    payoff = payoff_from_expression(expression)
+    _, samples, sample_payoffs = mc_kernel.run(kind=None, bytecode=payoff.bytecode, **KERNEL_ARGS)
+    expected = [payoff(float(path[-1]), path.tolist()) for path in samples]
+    np.testing.assert_allclose(sample_payoffs, expected, rtol=1e-9)
+
+
+@pytest.mark.skipif(
+    not mc_kernel._JIT_AVAILABLE or mc_kernel._prebuilt_run is None, reason="needs numba and fast_kernels"
+)
+@pytest.mark.parametrize("antithetic", [False, True])
+@pytest.mark.parametrize("expression", EXPRESSIONS[:2] + ["max(price - 100, 0)"])
+def test_jit_and_prebuilt_kernels_agree(monkeypatch, expression, antithetic):
+    bytecode = payoff_bytecode.compile_bytecode(expression)
+    args = dict(KERNEL_ARGS, kind=None, bytecode=bytecode, antithetic=antithetic, seed=11)
+    prebuilt = mc_kernel.run(**args)
+    monkeypatch.setattr(mc_kernel, "_prebuilt_run", None)
+    jit = mc_kernel.run(**args)
+
+    for prebuilt_values, jit_values in zip(prebuilt, jit):
+        np.testing.assert_array_equal(prebuilt_values, jit_values)
+
+
+def test_bytecode_kernel_matches_template_kernel(kernel):
+    bytecode = payoff_bytecode.compile_bytecode("max(price - 100, 0)")
+    template_sums, template_samples, _ = mc_kernel.run(kind="call", seed=5, **KERNEL_ARGS)
+    bytecode_sums, bytecode_samples, _ = mc_kernel.run(kind=None, bytecode=bytecode, seed=5, **KERNEL_ARGS)
+
+    np.testing.assert_allclose(bytecode_sums, template_sums, rtol=1e-12)
+    np.testing.assert_array_equal(bytecode_samples, template_samples)
+
+
+def test_non_finite_kernel_sums_fall_back_to_numpy(kernel):
+    options = dict(spot=100.0, maturity=1.0, rate=0.05, volatility=0.2, steps=8, paths=2000, backend="numba")
+    with pytest.raises(ZeroDivisionError):
+        monte_carlo_option_price(payoff=payoff_from_expression("1 / (price - price)"), **options)
+
+    sums, _, _ = mc_kernel.run(
+        kind=None, bytecode=payoff_bytecode.compile_bytecode("1 / (price - price)"), **KERNEL_ARGS
+    )
+    assert not np.isfinite(sums[0])
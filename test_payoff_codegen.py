@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+import pytest
+
+import payoff_codegen
+from monte_carlo_option import _evaluate_payoffs, payoff_from_expression
+
+# Rows include terminal prices below, at and above 100 and a flat path.
+PATHS = np.array(
+    [
+        [100.0, 95.0, 90.0, 85.0],
+        [100.0, 104.0, 98.0, 100.0],
+        [100.0, 110.0, 120.0, 130.0],
+        [100.0, 100.0, 100.0, 100.0],
+        [100.0, 80.0, 120.0, 93.5],
+    ]
+)
+PRICES = PATHS[:, -1].copy()
+
+EXPRESSIONS = [
+    "max(sum(path) / len(path) - price, 0)",
+    "exp(-price / 100) * sqrt(price) - max(path) / 2 + min(price, 100) * pi",
+    "max(path) - min(path)",
+    "path[-1] - path[-2] + path[1]",
+    "price % 7 + price // 7",
+    "(price - 100) % 7 - (price - 100) // 7",
+    # Divisors that are not exact in binary, where fmod and floor(a / b) disagree.
+    "price // 0.1 + price % 0.1",
+    "(price - 100) % -0.3 + (price - 100.5) // 0.7 - path[1] % 1.1",
+    "copysign(price, 100 - price) + pow(price, 0.5)",
+    "price > 100 and price - 100 or 0.5",
+    "(price < 90) or (price > 110) or -1",
+    "1 if 90 < price <= 120 else 2",
+    "exp(-price / 100) * sqrt(price) + log(price, 10)",
+    "max(price - 90, 0, price / 2) - min(path[0], price)",
+    "sum([price, 1, 2]) + fsum(path)",
+    # Comparisons with NaN are false, so only ``!=`` holds.
+    "(price * 0 * inf > 0) + 2 * (price * 0 * inf == 0) + 4 * (price * 0 * inf != 0)",
+]
+
+
+def _forms(payoff):
+    forms = {"native": payoff.native, "bytecode": payoff.bytecode}
+    if payoff.vector is not None:
+        forms["vector"] = payoff
+    return {name: form for name, form in forms.items() if form is not None}
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_compiled_forms_match_scalar(expression):
+    payoff = payoff_from_expression(expression)
+    expected = np.array([payoff(float(price), path.tolist()) for price, path in zip(PRICES, PATHS)])
+
+    for name, form in _forms(payoff).items():
+        with np.errstate(invalid="ignore"):
+            values = form.vector(PRICES, PATHS)
+        np.testing.assert_allclose(values, expected, rtol=1e-12, err_msg=name)
+    if payoff.native is not None:
+        assert payoff.native(PRICES[1], PATHS[1]) == pytest.approx(expected[1], rel=1e-12)
+
+
+@pytest.mark.skipif(not payoff_codegen.LLVM_AVAILABLE, reason="llvmlite is not installed")
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_native_compiles_supported_expressions(expression):
+    assert payoff_codegen.compile_native(expression) is not None
+
+
+@pytest.mark.parametrize("expression", ["path[1:]", "sum(path[1:])", "price if path else 0", "path[price]"])
+def test_native_rejects_unsupported_expressions(expression):
+    assert payoff_codegen.compile_native(expression) is None
+
+
+@pytest.mark.skipif(not payoff_codegen.LLVM_AVAILABLE, reason="llvmlite is not installed")
+def test_native_yields_non_finite_values_instead_of_raising():
+    native = payoff_codegen.compile_native("1 / (price - 100) + path[7]")
+    values = native.vector(PRICES, PATHS)
+    assert not np.isfinite(values).any()
+
+
+def test_non_finite_compiled_values_fall_back_to_scalar_errors():
+    payoff = payoff_from_expression("1 / (price - 100)")
+    with pytest.raises(ZeroDivisionError):
+        _evaluate_payoffs(payoff, PRICES, PATHS)
+
+    finite = PATHS[PRICES != 100.0]
+    np.testing.assert_allclose(_evaluate_payoffs(payoff, finite[:, -1], finite), 1 / (finite[:, -1] - 100))
+
+
+@pytest.mark.parametrize("expression", ["path[0] / (price - price)", "price % 0", "path[-1] // (price - price)"])
+def test_division_by_zero_raises(expression):
+    with pytest.raises(ZeroDivisionError):
+        _evaluate_payoffs(payoff_from_expression(expression), PRICES, PATHS)
+
+
+@pytest.mark.parametrize("expression", ["price[0]", "len(price)", "path[0][1]", "max(price)"])
+def test_invalid_per_path_expressions_raise(expression):
+    payoff = payoff_from_expression(expression)
+    assert payoff.vector is None
+    with pytest.raises(TypeError):
+        _evaluate_payoffs(payoff, PRICES, PATHS)
+
+
+def test_scalar_payoff_sees_floats_and_lists():
+    seen = []
+
+    def payoff(price, path):
+        seen.append((type(price), type(path), type(path[0])))
+        return 0.0
+
+    _evaluate_payoffs(payoff, PRICES, PATHS)
+    assert set(seen) == {(float, list, float)}
+
+
+def test_constant_expression_is_broadcast():
+    payoff = payoff_from_expression("min(2, 3) + pi")
+    np.testing.assert_array_equal(_evaluate_payoffs(payoff, PRICES, PATHS), np.full(len(PRICES), 2 + math.pi))
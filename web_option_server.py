@@ -9,14 +9,107 @@ Run the server:
 """
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 
-from flask import Flask, jsonify, render_template_string, request
+from flask import Flask, jsonify, request
 
 from monte_carlo_option import monte_carlo_option_price, payoff_from_expression
 
 app = Flask(__name__)
 
+# Large NumPy simulations are split across these workers so one request can use
+# every core. Spawned workers avoid forking a multi-threaded server process; they
+# re-import this module when it runs as a script, so the pool is only created on
+# first use in the server process.
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+        return _POOL
+
+
+_DEFAULTS = {
+    "spot": 100.0,
+    "maturity": 1.0,
+    "rate": 0.05,
+    "volatility": 0.2,
+    "steps": 50,
+    "paths": 5000,
+    "payoff": "max(price - 100, 0)",
+}
+
+TEMPLATE_SRC = """<!doctype html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>Monte Carlo Option Pricer</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 2rem auto; max-width: 800px; }
+        label { display: block; margin-top: 0.5rem; }
+        input, textarea { width: 100%; padding: 0.5rem; }
+        .result { background: #f6f8fa; padding: 1rem; border-radius: 8px; margin-top: 1rem; }
+        .error { color: #b00020; }
+        .grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 0.75rem; }
+        button { margin-top: 1rem; padding: 0.6rem 1.2rem; }
+        code { background: #eef; padding: 0.1rem 0.3rem; border-radius: 4px; }
+    </style>
+</head>
+<body>
+    <h1>Monte Carlo Option Pricer</h1>
+    <p>Provide model inputs and a payoff expression that references <code>price</code> (terminal) and <code>path</code> (full path).</p>
+    <form method="post">
+        <div class="grid">
+            {% for name, label in [('spot','Spot price'),('maturity','Maturity (years)'),('rate','Risk-free rate'),('volatility','Volatility'),('steps','Steps per path'),('paths','Number of paths')] %}
+                <label>{{ label }}<input name="{{ name }}" value="{{ request.form.get(name, defaults[name]) }}" required></label>
+            {% endfor %}
+        </div>
+        <label>Payoff expression
+            <textarea name="payoff" rows="2" required>{{ request.form.get('payoff', defaults['payoff']) }}</textarea>
+        </label>
+        <button type="submit">Run simulation</button>
+    </form>
+    {% if message %}
+        <div class="result {{ 'error' if result_payload is none else '' }}">{{ message }}</div>
+    {% endif %}
+    {% if result_payload %}
+        <div class="result">
+            <h3>Result</h3>
+            <p><strong>Price:</strong> {{ '%.6f'|format(result_payload['price']) }} &plusmn; {{ '%.6f'|format(result_payload['stderr']) }}</p>
+            <p><strong>Paths simulated:</strong> {{ result_payload['path_count'] }} | <strong>Steps per path:</strong> {{ result_payload['steps'] }}</p>
+            <p><strong>Sample payoffs:</strong> {{ result_payload['sample_payoffs'] }}</p>
+            <details>
+                <summary>Show sample paths (first 3)</summary>
+                <pre>{{ result_payload['sample_paths']|tojson(indent=2) }}</pre>
+            </details>
+        </div>
+    {% endif %}
+    <h2>API usage</h2>
+    <p>Send a JSON POST to <code>/api/price</code> with the same fields as the form:</p>
+    <pre>{
+  "spot": 100,
+  "maturity": 1,
+  "rate": 0.05,
+  "volatility": 0.2,
+  "steps": 50,
+  "paths": 10000,
+  "payoff": "max(price - 100, 0)"
+}</pre>
+</body>
+</html>
+"""
+
+# Compiled once at import instead of on every render.
+_TEMPLATE = app.jinja_env.from_string(TEMPLATE_SRC)
+
 
 def _parse_inputs(data: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
     """Normalize and validate pricing inputs from a mapping.
@@ -53,6 +146,13 @@ def _parse_inputs(data: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
         "steps": as_int("steps"),
         "paths": as_int("paths"),
     }
+    if data.get("seed") not in (None, ""):
+        try:
+            params["seed"] = int(data["seed"])
+        except (TypeError, ValueError):
+            raise ValueError("seed must be an integer.")
+        if params["seed"] < 0:
+            raise ValueError("seed must be non-negative.")
 
     return params, payoff_expression
 
@@ -60,14 +160,13 @@ def _parse_inputs(data: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
 def _format_result(result) -> Dict[str, Any]:
     """Create a lightweight JSON-serializable view of the result."""
 
-    sample_paths = result.paths[:3]
-    sample_payoffs = result.payoffs[:5]
     return {
         "price": result.price,
-        "sample_payoffs": sample_payoffs,
-        "sample_paths": sample_paths,
-        "path_count": len(result.paths),
-        "steps": len(result.paths[0]) - 1 if result.paths else 0,
+        "stderr": result.stderr,
+        "sample_payoffs": result.sample_payoffs[:5].tolist(),
+        "sample_paths": result.sample_paths[:3].tolist(),
+        "path_count": result.n_paths,
+        "steps": result.sample_paths.shape[1] - 1,
     }
 
 
@@ -76,88 +175,19 @@ def index():
     message = None
     result_payload: Dict[str, Any] | None = None
 
-    defaults = {
-        "spot": 100.0,
-        "maturity": 1.0,
-        "rate": 0.05,
-        "volatility": 0.2,
-        "steps": 50,
-        "paths": 5000,
-        "payoff": "max(price - 100, 0)",
-    }
-
     if request.method == "POST":
         try:
             params, payoff_expression = _parse_inputs(request.form)
             payoff_fn = payoff_from_expression(payoff_expression)
-            result = monte_carlo_option_price(payoff=payoff_fn, **params)
+            result = monte_carlo_option_price(payoff=payoff_fn, executor=_pool(), **params)
             result_payload = _format_result(result)
-            message = f"Estimated option price: {result.price:.6f}"
+            message = f"Estimated option price: {result.price:.6f} (standard error {result.stderr:.6f})"
         except ValueError as exc:
             message = str(exc)
 
-    template = """
-    <!doctype html>
-    <html lang="en">
-    <head>
-        <meta charset="utf-8">
-        <title>Monte Carlo Option Pricer</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 2rem auto; max-width: 800px; }
-            label { display: block; margin-top: 0.5rem; }
-            input, textarea { width: 100%; padding: 0.5rem; }
-            .result { background: #f6f8fa; padding: 1rem; border-radius: 8px; margin-top: 1rem; }
-            .error { color: #b00020; }
-            .grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 0.75rem; }
-            button { margin-top: 1rem; padding: 0.6rem 1.2rem; }
-            code { background: #eef; padding: 0.1rem 0.3rem; border-radius: 4px; }
-        </style>
-    </head>
-    <body>
-        <h1>Monte Carlo Option Pricer</h1>
-        <p>Provide model inputs and a payoff expression that references <code>price</code> (terminal) and <code>path</code> (full path).</p>
-        <form method="post">
-            <div class="grid">
-                {% for name, label in [('spot','Spot price'),('maturity','Maturity (years)'),('rate','Risk-free rate'),('volatility','Volatility'),('steps','Steps per path'),('paths','Number of paths')] %}
-                    <label>{{ label }}<input name="{{ name }}" value="{{ request.form.get(name, defaults[name]) }}" required></label>
-                {% endfor %}
-            </div>
-            <label>Payoff expression
-                <textarea name="payoff" rows="2" required>{{ request.form.get('payoff', defaults['payoff']) }}</textarea>
-            </label>
-            <button type="submit">Run simulation</button>
-        </form>
-        {% if message %}
-            <div class="result {{ 'error' if result_payload is none else '' }}">{{ message }}</div>
-        {% endif %}
-        {% if result_payload %}
-            <div class="result">
-                <h3>Result</h3>
-                <p><strong>Price:</strong> {{ '%.6f'|format(result_payload['price']) }}</p>
-                <p><strong>Paths simulated:</strong> {{ result_payload['path_count'] }} | <strong>Steps per path:</strong> {{ result_payload['steps'] }}</p>
-                <p><strong>Sample payoffs:</strong> {{ result_payload['sample_payoffs'] }}</p>
-                <details>
-                    <summary>Show sample paths (first 3)</summary>
-                    <pre>{{ result_payload['sample_paths']|tojson(indent=2) }}</pre>
-                </details>
-            </div>
-        {% endif %}
-        <h2>API usage</h2>
-        <p>Send a JSON POST to <code>/api/price</code> with the same fields as the form:</p>
-        <pre>{
-  "spot": 100,
-  "maturity": 1,
-  "rate": 0.05,
-  "volatility": 0.2,
-  "steps": 50,
-  "paths": 10000,
-  "payoff": "max(price - 100, 0)"
-}</pre>
-    </body>
-    </html>
-    """
-
-    return render_template_string(template, message=message, result_payload=result_payload, defaults=defaults)
+    return _TEMPLATE.render(
+        message=message, result_payload=result_payload, defaults=_DEFAULTS, request=request
+    )
 
 
 @app.post("/api/price")
@@ -168,7 +198,7 @@ def api_price():
             raise ValueError("JSON body must be an object.")
         params, payoff_expression = _parse_inputs(payload)
         payoff_fn = payoff_from_expression(payoff_expression)
-        result = monte_carlo_option_price(payoff=payoff_fn, **params)
+        result = monte_carlo_option_price(payoff=payoff_fn, executor=_pool(), **params)
         return jsonify(_format_result(result))
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400